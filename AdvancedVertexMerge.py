@@ -1,8 +1,279 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import bpy # type: ignore
 import bmesh # type: ignore
-from mathutils import Vector # type: ignore
+from mathutils import kdtree # type: ignore
 from bpy.types import Operator, PropertyGroup # type: ignore
-from bpy.props import FloatProperty, BoolProperty, EnumProperty # type: ignore
+from bpy.props import FloatProperty, BoolProperty, EnumProperty, IntProperty, PointerProperty # type: ignore
+from .utils import connected_labels
+
+# Offsets of a grid cell and its 26 neighbors
+_CELL_OFFSETS = np.array(
+    [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)],
+    dtype=np.int64
+)
+
+def _hash_cells(cells):
+    """Spatial hash of integer grid cells (collisions only add extra candidates)"""
+    return (cells[:, 0] * 73856093) ^ (cells[:, 1] * 19349663) ^ (cells[:, 2] * 83492791)
+
+def find_merge_pairs(coords, distance):
+    """
+    Find all vertex pairs closer than `distance` using a uniform grid hash
+    with cells of size `distance`. Returns (a, b, dist) arrays with a < b.
+    """
+    count = len(coords)
+    if count < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    cells = np.floor(coords / distance).astype(np.int64)
+    order = np.argsort(_hash_cells(cells), kind='stable')
+    sorted_keys = _hash_cells(cells)[order]
+    indices = np.arange(count, dtype=np.int64)
+
+    pairs_a, pairs_b, pair_dists = [], [], []
+    for offset in _CELL_OFFSETS:
+        neighbor_keys = _hash_cells(cells + offset)
+        starts = np.searchsorted(sorted_keys, neighbor_keys, side='left')
+        counts = np.searchsorted(sorted_keys, neighbor_keys, side='right') - starts
+        total = int(counts.sum())
+        if not total:
+            continue
+
+        # Expand every vertex against all vertices stored in its neighbor cell
+        a = np.repeat(indices, counts)
+        slot = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        b = order[np.repeat(starts, counts) + slot]
+
+        keep = a < b
+        a, b = a[keep], b[keep]
+        dist = np.linalg.norm(coords[a] - coords[b], axis=1)
+        within = dist <= distance
+        pairs_a.append(a[within])
+        pairs_b.append(b[within])
+        pair_dists.append(dist[within])
+
+    if not pairs_a:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+
+    a = np.concatenate(pairs_a)
+    b = np.concatenate(pairs_b)
+    dist = np.concatenate(pair_dists)
+
+    # Hash collisions between neighbor cells can report the same pair twice
+    _keys, unique = np.unique(a * count + b, return_index=True)
+    return a[unique], b[unique], dist[unique]
+
+def find_merge_pairs_kdtree(coords, distance):
+    """
+    Find all vertex pairs closer than `distance` with a mathutils KD-tree.
+    Returns (a, b, dist) arrays with a < b.
+    """
+    points = coords.tolist()
+    tree = kdtree.KDTree(len(points))
+    for i, co in enumerate(points):
+        tree.insert(co, i)
+    tree.balance()
+
+    pairs_a, pairs_b, pair_dists = [], [], []
+    for i, co in enumerate(points):
+        for _co, j, dist in tree.find_range(co, distance):
+            if j > i:
+                pairs_a.append(i)
+                pairs_b.append(j)
+                pair_dists.append(dist)
+
+    return (
+        np.array(pairs_a, dtype=np.int64),
+        np.array(pairs_b, dtype=np.int64),
+        np.array(pair_dists, dtype=np.float32)
+    )
+
+# Candidate pairs per mesh name, validated against a hash of the merged vertices
+_pair_cache = {}
+_PAIR_CACHE_SIZE = 32
+
+def cached_merge_labels(mesh_key, indices, coords, merge_distance, find_pairs=find_merge_pairs):
+    """
+    Cluster labels for `coords`, reusing the candidate pairs of the last search
+    on the same geometry. A smaller distance filters the cached pairs instead
+    of searching again, and the labels of each distance are kept so changing
+    only the merge mode does no search at all.
+    """
+    geometry_hash = hash((indices.tobytes(), coords.tobytes()))
+    entry = _pair_cache.get(mesh_key)
+
+    if entry is None or entry['hash'] != geometry_hash or merge_distance > entry['distance']:
+        entry = {
+            'hash': geometry_hash,
+            'distance': merge_distance,
+            'pairs': find_pairs(coords, merge_distance),
+            'labels': {},
+        }
+        _pair_cache.pop(mesh_key, None)
+        _pair_cache[mesh_key] = entry
+        for stale_key in list(_pair_cache)[:-_PAIR_CACHE_SIZE]:
+            _pair_cache.pop(stale_key, None)
+
+    labels = entry['labels'].get(merge_distance)
+    if labels is None:
+        pairs_a, pairs_b, pair_dists = entry['pairs']
+        within = pair_dists <= merge_distance
+        labels = connected_labels(len(coords), pairs_a[within], pairs_b[within])
+        entry['labels'][merge_distance] = labels
+    return labels
+
+def resolve_targets(coords, labels, merge_mode):
+    """
+    Pick a target for every cluster of `labels`.
+    Returns (targets, positions): targets[i] is the vertex i welds onto and
+    positions holds the new coordinates of the targets.
+    """
+    count = len(labels)
+    indices = np.arange(count, dtype=np.int64)
+    sizes = np.bincount(labels, minlength=count)
+
+    if merge_mode == 'LAST':
+        last = np.zeros(count, dtype=np.int64)
+        np.maximum.at(last, labels, indices)
+        targets = last[labels]
+    else:
+        # Labels are the smallest index of each cluster
+        targets = labels.copy()
+
+    positions = np.array(coords, dtype=np.float64)
+    if merge_mode == 'CENTER':
+        roots = np.flatnonzero(sizes > 1)
+        for axis in range(3):
+            sums = np.bincount(labels, weights=positions[:, axis], minlength=count)
+            positions[roots, axis] = sums[roots] / sizes[roots]
+
+    return targets, positions
+
+def weld_targets(bm, indices, targets, positions):
+    """
+    Apply resolved targets to a bmesh in a single weld.
+    `indices` maps the local vertex order used for clustering to bmesh indices.
+    """
+    moved = np.flatnonzero(targets != np.arange(len(targets)))
+    if not moved.size:
+        return 0
+
+    lookup = np.asarray(indices).tolist()
+    for i in np.unique(targets[moved]).tolist():
+        bm.verts[lookup[i]].co = positions[i]
+
+    target_map = {
+        bm.verts[lookup[i]]: bm.verts[lookup[j]]
+        for i, j in zip(moved.tolist(), targets[moved].tolist())
+    }
+    bmesh.ops.weld_verts(bm, targetmap=target_map)
+    return len(target_map)
+
+def read_edit_buffers(bm, limit_to_selection):
+    """
+    Read the vertex coordinates of an edit-mode bmesh.
+    Returns (indices, coords, selected) for the vertices that take part in the merge.
+    """
+    bm.verts.ensure_lookup_table()
+    bm.verts.index_update()
+
+    if limit_to_selection:
+        vertices = [v for v in bm.verts if v.select]
+    else:
+        vertices = list(bm.verts)
+
+    indices = np.array([v.index for v in vertices], dtype=np.int64)
+    coords = np.array([v.co for v in vertices], dtype=np.float32).reshape(-1, 3)
+    selected = np.array([v.select for v in vertices], dtype=bool)
+    return indices, coords, selected
+
+def read_mesh_buffers(mesh, limit_to_selection):
+    """
+    Read the vertex coordinates of an object-mode mesh.
+    Returns (indices, coords, selected) for the vertices that take part in the merge.
+    """
+    vertex_count = len(mesh.vertices)
+    coords = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    coords.shape = (vertex_count, 3)
+    selected = np.empty(vertex_count, dtype=bool)
+    mesh.vertices.foreach_get("select", selected)
+
+    if limit_to_selection:
+        indices = np.flatnonzero(selected)
+    else:
+        indices = np.arange(vertex_count, dtype=np.int64)
+
+    return indices, coords[indices], selected[indices]
+
+def snap_targets(coords, selected, merge_distance):
+    """
+    Map every selected vertex onto its nearest unselected vertex within
+    `merge_distance`, using one KD-tree built over the unselected vertices.
+    Returns (targets, positions) in the same layout as resolve_targets.
+    """
+    unselected = np.flatnonzero(~selected)
+    tree = kdtree.KDTree(len(unselected))
+    for i, co in zip(unselected.tolist(), coords[unselected].tolist()):
+        tree.insert(co, i)
+    tree.balance()
+
+    targets = np.arange(len(coords), dtype=np.int64)
+    snapped = np.flatnonzero(selected)
+    for i, co in zip(snapped.tolist(), coords[snapped].tolist()):
+        _co, j, dist = tree.find(co)
+        if j is not None and dist <= merge_distance:
+            targets[i] = j
+
+    return targets, np.array(coords, dtype=np.float64)
+
+def cluster_coords(mesh_key, indices, coords, selected, merge_distance, merge_mode, find_pairs=find_merge_pairs):
+    """Cluster a plain coordinate array into merge targets (safe to run off the main thread)"""
+    if merge_mode == 'SNAP':
+        return snap_targets(coords, selected, merge_distance)
+    labels = cached_merge_labels(mesh_key, indices, coords, merge_distance, find_pairs)
+    return resolve_targets(coords, labels, merge_mode)
+
+def select_mesh_vertices(mesh, vertex_mask):
+    """Replace the selection of an object-mode mesh with `vertex_mask`, flushed to edges and faces"""
+    mesh.vertices.foreach_set("select", vertex_mask)
+
+    edge_verts = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    mesh.edges.foreach_set("select", vertex_mask[edge_verts].reshape(-1, 2).all(axis=1))
+
+    if len(mesh.polygons):
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+        loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_starts)
+        mesh.polygons.foreach_set("select", np.logical_and.reduceat(vertex_mask[loop_verts], loop_starts))
+
+    mesh.update()
+
+def apply_mesh_welds(mesh, indices, targets, positions):
+    """Write resolved targets back to an object-mode mesh through one bmesh weld"""
+    if not np.any(targets != np.arange(len(targets))):
+        return 0
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        bm.verts.ensure_lookup_table()
+        merged_count = weld_targets(bm, indices, targets, positions)
+        bm.to_mesh(mesh)
+    finally:
+        bm.free()
+    mesh.update()
+    return merged_count
+
+def limit_to_selection(settings):
+    """Snapping needs the unselected vertices as targets, so it never limits to the selection"""
+    return settings.limit_to_selection and settings.merge_mode != 'SNAP'
 
 class ZTOOLS_PG_VertexMergeSettings(PropertyGroup):
     """Property group for vertex merge tool settings"""
@@ -22,7 +293,8 @@ class ZTOOLS_PG_VertexMergeSettings(PropertyGroup):
         items=[
             ('CENTER', 'Center Point', 'Merge to average center point'),
             ('FIRST', 'First Selected', 'Merge to first selected vertex'),
-            ('LAST', 'Last Selected', 'Merge to last selected vertex')
+            ('LAST', 'Last Selected', 'Merge to last selected vertex'),
+            ('SNAP', 'Selected to Unselected', 'Weld selected vertices onto the nearest unselected vertex')
         ],
         default='CENTER'
     ) # type: ignore
@@ -33,6 +305,31 @@ class ZTOOLS_PG_VertexMergeSettings(PropertyGroup):
         default=False
     ) # type: ignore
 
+    scope: EnumProperty(
+        name="Scope",
+        description="Meshes to merge",
+        items=[
+            ('ACTIVE', 'Active Object', 'Merge the active object only'),
+            ('SELECTED', 'Selected Objects', 'Merge every selected mesh object'),
+            ('COLLECTION', 'Collection', 'Merge every mesh object in a collection')
+        ],
+        default='ACTIVE'
+    ) # type: ignore
+
+    target_collection: PointerProperty(
+        name="Collection",
+        description="Collection whose meshes are merged",
+        type=bpy.types.Collection
+    ) # type: ignore
+
+    worker_count: IntProperty(
+        name="Worker Threads",
+        description="Number of threads used for clustering (0 = automatic)",
+        default=0,
+        min=0,
+        max=64
+    ) # type: ignore
+
 class ZTOOLS_OT_AdvancedVertexMerge(Operator):
     """Advanced Vertex Merge Tool"""
     bl_idname = "ztools.advanced_vertex_merge"
@@ -41,86 +338,147 @@ class ZTOOLS_OT_AdvancedVertexMerge(Operator):
 
     @classmethod
     def poll(cls, context):
+        if context.scene.ztools_vertex_merge_settings.scope != 'ACTIVE':
+            return context.mode == 'OBJECT'
         return (context.active_object is not None and 
                 context.active_object.type == 'MESH' and 
-                context.active_object.mode == 'EDIT')
+                context.active_object.mode in {'EDIT', 'OBJECT'})
 
     def execute(self, context):
         settings = context.scene.ztools_vertex_merge_settings
         obj = context.active_object
-        
-        # Create a fresh bmesh each time
-        bm = bmesh.from_edit_mesh(obj.data)
-        bm.verts.ensure_lookup_table()
-        bm.verts.index_update()
+        start_time = time.perf_counter()
+        edit_mode = settings.scope == 'ACTIVE' and obj.mode == 'EDIT'
 
-        # Track vertices to merge
-        vertices_to_merge = []
-
-        # Determine vertices to process
-        if settings.limit_to_selection:
-            vertices = [v for v in bm.verts if v.select and v.is_valid]
+        if edit_mode:
+            meshes = [obj.data]
         else:
-            vertices = [v for v in bm.verts if v.is_valid]
-
-        # First pass: find vertices to merge
-        for i, base_vert in enumerate(vertices):
-            if not base_vert.is_valid:
-                continue
-            
-            nearby_verts = [
-                v for v in vertices[i+1:] 
-                if v.is_valid and 
-                v != base_vert and 
-                (base_vert.co - v.co).length <= settings.merge_distance
-            ]
-            
-            if nearby_verts:
-                vertices_to_merge.append([base_vert] + nearby_verts)
-
-        # Second pass: merge vertices
-        merged_count = 0
-        for merge_group in vertices_to_merge:
-            # Filter out invalid vertices
-            valid_group = [v for v in merge_group if v.is_valid]
-            
-            if not valid_group:
-                continue
-
-            if settings.merge_mode == 'CENTER':
-                # Safely calculate center
-                try:
-                    target_co = sum((v.co for v in valid_group), Vector()) / len(valid_group)
-                    valid_group[0].co = target_co
-                except Exception as e:
-                    print(f"Error calculating center: {e}")
-                    continue
-
-            elif settings.merge_mode == 'FIRST':
-                target_co = valid_group[0].co
-            elif settings.merge_mode == 'LAST':
-                target_co = valid_group[-1].co
-                valid_group[0].co = target_co
-
-            # Remove duplicate vertices
-            for v in valid_group[1:]:
-                if v.is_valid:
-                    try:
-                        bm.verts.remove(v)
-                        merged_count += 1
-                    except Exception as e:
-                        print(f"Error removing vertex: {e}")
-
-        # Update bmesh
+            meshes = self.collect_meshes(context, settings)
+            if not meshes:
+                self.report({'WARNING'}, "No mesh objects to merge")
+                return {'CANCELLED'}
+
         try:
-            bmesh.update_edit_mesh(obj.data)
-            self.report({'INFO'}, f"Merged Vertices: {merged_count}")
+            if edit_mode:
+                merged_count = self.merge_edit_mesh(obj, settings)
+            else:
+                merged_count = self.merge_object_meshes(meshes, settings)
+            elapsed = time.perf_counter() - start_time
+            self.report({'INFO'}, f"Merged Vertices: {merged_count} in {len(meshes)} mesh(es) | Time: {elapsed:.3f}s")
         except Exception as e:
             self.report({'ERROR'}, f"Mesh update failed: {e}")
             return {'CANCELLED'}
 
         return {'FINISHED'}
 
+    def collect_meshes(self, context, settings):
+        """Collect the unique mesh datablocks in the chosen scope"""
+        if settings.scope == 'SELECTED':
+            objects = context.selected_objects
+        elif settings.scope == 'COLLECTION':
+            collection = settings.target_collection
+            objects = collection.all_objects if collection else []
+        else:
+            objects = [context.active_object]
+
+        # Objects sharing a mesh must only merge it once
+        meshes = {}
+        for obj in objects:
+            if obj.type == 'MESH' and obj.data.library is None:
+                meshes.setdefault(obj.data.as_pointer(), obj.data)
+        return list(meshes.values())
+
+    def merge_edit_mesh(self, obj, settings):
+        """Merge vertices of a mesh in edit mode using a KD-tree neighbor search"""
+        bm = bmesh.from_edit_mesh(obj.data)
+        indices, coords, selected = read_edit_buffers(bm, limit_to_selection(settings))
+
+        # Cluster the candidate pairs into disjoint groups so chains merge transitively
+        targets, positions = cluster_coords(
+            obj.data.name_full, indices, coords, selected,
+            settings.merge_distance, settings.merge_mode, find_merge_pairs_kdtree
+        )
+
+        merged_count = weld_targets(bm, indices, targets, positions)
+        bmesh.update_edit_mesh(obj.data)
+        return merged_count
+
+    def merge_object_meshes(self, meshes, settings):
+        """Merge object-mode meshes, clustering their coordinate buffers in a thread pool"""
+        # Buffers are read and welds applied on the main thread, only NumPy work is pooled
+        buffers = [read_mesh_buffers(mesh, limit_to_selection(settings)) for mesh in meshes]
+        merge_distance = settings.merge_distance
+        merge_mode = settings.merge_mode
+
+        def cluster(job):
+            mesh_key, (indices, coords, selected) = job
+            return cluster_coords(mesh_key, indices, coords, selected, merge_distance, merge_mode)
+
+        jobs = list(zip([mesh.name_full for mesh in meshes], buffers))
+        if len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=settings.worker_count or None) as pool:
+                results = list(pool.map(cluster, jobs))
+        else:
+            results = [cluster(job) for job in jobs]
+
+        merged_count = 0
+        for mesh, (indices, _coords, _selected), (targets, positions) in zip(meshes, buffers, results):
+            merged_count += apply_mesh_welds(mesh, indices, targets, positions)
+        return merged_count
+
+class ZTOOLS_OT_PreviewVertexMerge(Operator):
+    """Select the vertices that would be merged without changing the mesh"""
+    bl_idname = "ztools.preview_vertex_merge"
+    bl_label = "Preview Vertex Merge"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return (context.active_object is not None and 
+                context.active_object.type == 'MESH' and 
+                context.active_object.mode in {'EDIT', 'OBJECT'})
+
+    def execute(self, context):
+        settings = context.scene.ztools_vertex_merge_settings
+        obj = context.active_object
+        mesh = obj.data
+
+        if obj.mode == 'EDIT':
+            bm = bmesh.from_edit_mesh(mesh)
+            indices, coords, selected = read_edit_buffers(bm, limit_to_selection(settings))
+            find_pairs = find_merge_pairs_kdtree
+        else:
+            indices, coords, selected = read_mesh_buffers(mesh, limit_to_selection(settings))
+            find_pairs = find_merge_pairs
+
+        targets, _positions = cluster_coords(
+            mesh.name_full, indices, coords, selected,
+            settings.merge_distance, settings.merge_mode, find_pairs
+        )
+        moved = targets != np.arange(len(targets))
+        clustered = moved.copy()
+        # Snap targets are unselected vertices, selecting them would turn them into sources
+        if settings.merge_mode != 'SNAP':
+            clustered[targets[moved]] = True
+        cluster_count = int(np.unique(targets[moved]).size)
+        merge_count = int(np.count_nonzero(moved))
+
+        # Highlight every vertex that belongs to a cluster, only the snapping ones in SNAP mode
+        if obj.mode == 'EDIT':
+            for v in bm.verts:
+                v.select = False
+            for i in indices[clustered].tolist():
+                bm.verts[i].select = True
+            bm.select_flush_mode()
+            bmesh.update_edit_mesh(mesh)
+        else:
+            vertex_mask = np.zeros(len(mesh.vertices), dtype=bool)
+            vertex_mask[indices[clustered]] = True
+            select_mesh_vertices(mesh, vertex_mask)
+
+        self.report({'INFO'}, f"Preview: {merge_count} vertices would merge into {cluster_count} clusters")
+        return {'FINISHED'}
+
 def draw_panel(context, layout):
     """Draw function for vertex merge UI"""
     settings = context.scene.ztools_vertex_merge_settings
@@ -130,14 +488,23 @@ def draw_panel(context, layout):
     box.prop(settings, "merge_distance")
     box.prop(settings, "merge_mode")
     box.prop(settings, "limit_to_selection")
-    box.operator("ztools.advanced_vertex_merge", text="Merge Vertices")
+    box.prop(settings, "scope")
+    if settings.scope == 'COLLECTION':
+        box.prop(settings, "target_collection")
+    if settings.scope != 'ACTIVE':
+        box.prop(settings, "worker_count")
+    row = box.row(align=True)
+    row.operator("ztools.preview_vertex_merge", text="Preview")
+    row.operator("ztools.advanced_vertex_merge", text="Merge Vertices")
 
 def register():
     bpy.utils.register_class(ZTOOLS_PG_VertexMergeSettings)
     bpy.utils.register_class(ZTOOLS_OT_AdvancedVertexMerge)
+    bpy.utils.register_class(ZTOOLS_OT_PreviewVertexMerge)
     bpy.types.Scene.ztools_vertex_merge_settings = bpy.props.PointerProperty(type=ZTOOLS_PG_VertexMergeSettings)
 
 def unregister():
     bpy.utils.unregister_class(ZTOOLS_PG_VertexMergeSettings)
     bpy.utils.unregister_class(ZTOOLS_OT_AdvancedVertexMerge)
+    bpy.utils.unregister_class(ZTOOLS_OT_PreviewVertexMerge)
     del bpy.types.Scene.ztools_vertex_merge_settings
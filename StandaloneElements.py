@@ -1,14 +1,274 @@
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 import bpy
 import bmesh
-from bpy.props import EnumProperty, CollectionProperty, IntProperty, BoolProperty, StringProperty, FloatVectorProperty
+import numpy as np
+from bpy.props import EnumProperty, CollectionProperty, IntProperty, BoolProperty, StringProperty, FloatVectorProperty, FloatProperty, IntVectorProperty, PointerProperty
+from bpy.app.handlers import persistent
 from bpy.types import Operator, PropertyGroup, UIList
+from .utils import connected_labels
+
+def read_object_mesh(obj):
+    """Return the object's mesh data, synced with edit mode when needed"""
+    if obj.mode == 'EDIT':
+        obj.update_from_editmode()
+    return obj.data
+
+def read_mesh_buffers(mesh):
+    """Read every buffer the element checks need with foreach_get"""
+    vertex_count = len(mesh.vertices)
+    edge_count = len(mesh.edges)
+    loop_count = len(mesh.loops)
+    face_count = len(mesh.polygons)
+
+    buffers = {
+        'coords': np.empty(vertex_count * 3, dtype=np.float32),
+        'edge_verts': np.empty(edge_count * 2, dtype=np.int32),
+        'loop_verts': np.empty(loop_count, dtype=np.int32),
+        'loop_edges': np.empty(loop_count, dtype=np.int32),
+        'loop_starts': np.empty(face_count, dtype=np.int32),
+        'loop_totals': np.empty(face_count, dtype=np.int32),
+        'face_areas': np.empty(face_count, dtype=np.float32),
+        'face_centers': np.empty(face_count * 3, dtype=np.float32),
+    }
+    mesh.vertices.foreach_get("co", buffers['coords'])
+    mesh.edges.foreach_get("vertices", buffers['edge_verts'])
+    mesh.loops.foreach_get("vertex_index", buffers['loop_verts'])
+    mesh.loops.foreach_get("edge_index", buffers['loop_edges'])
+    mesh.polygons.foreach_get("loop_start", buffers['loop_starts'])
+    mesh.polygons.foreach_get("loop_total", buffers['loop_totals'])
+    mesh.polygons.foreach_get("area", buffers['face_areas'])
+    mesh.polygons.foreach_get("center", buffers['face_centers'])
+
+    buffers['coords'].shape = (vertex_count, 3)
+    buffers['edge_verts'].shape = (edge_count, 2)
+    buffers['face_centers'].shape = (face_count, 3)
+    return buffers
+
+def mesh_revision(mesh, buffers):
+    """Signature of a mesh's topology and vertex positions, used to detect a stale element list"""
+    checksum = zlib.crc32(buffers['loop_verts'].tobytes(), zlib.crc32(buffers['edge_verts'].tobytes()))
+    # Zero-length and zero-area results depend on positions, not just topology
+    checksum = zlib.crc32(buffers['coords'].tobytes(), checksum)
+    return f"{mesh.name_full}:{len(mesh.vertices)}:{len(mesh.edges)}:{len(mesh.polygons)}:{checksum:08x}"
+
+def find_islands(buffers):
+    """
+    Label the connected parts of a mesh with union-find over its edges.
+    Returns (vertex_labels, island_ids, face_counts, areas, centers) for
+    every island that has faces; an island id is its smallest vertex index.
+    """
+    vertex_count = len(buffers['coords'])
+    edge_verts = buffers['edge_verts']
+    vertex_labels = connected_labels(vertex_count, edge_verts[:, 0], edge_verts[:, 1])
+
+    face_labels = vertex_labels[buffers['loop_verts'][buffers['loop_starts']]]
+    face_counts = np.bincount(face_labels, minlength=vertex_count)
+    island_ids = np.flatnonzero(face_counts)
+    face_counts = face_counts[island_ids]
+    areas = np.bincount(face_labels, weights=buffers['face_areas'], minlength=vertex_count)[island_ids]
+    centers = np.stack([
+        np.bincount(face_labels, weights=buffers['face_centers'][:, axis], minlength=vertex_count)[island_ids]
+        for axis in range(3)
+    ], axis=1) / face_counts[:, None]
+
+    return vertex_labels, island_ids, face_counts, areas, centers
+
+def find_duplicate_faces(buffers):
+    """Faces using the same vertex set as an earlier face, found per face size by sorted vertex rows"""
+    loop_starts = buffers['loop_starts']
+    loop_totals = buffers['loop_totals']
+    duplicates = []
+
+    for size in np.unique(loop_totals).tolist():
+        faces = np.flatnonzero(loop_totals == size)
+        rows = buffers['loop_verts'][loop_starts[faces][:, None] + np.arange(size)]
+        rows.sort(axis=1)
+        _rows, first, inverse = np.unique(rows, axis=0, return_index=True, return_inverse=True)
+        duplicates.append(faces[first[inverse.ravel()] != np.arange(len(faces))])
+
+    if not duplicates:
+        return np.empty(0, dtype=np.int64)
+    return np.sort(np.concatenate(duplicates))
+
+def find_standalone_elements(buffers, element_type, max_island_faces=0, max_island_area=0.0,
+                             min_edge_length=0.0, min_face_area=0.0):
+    """
+    Find standalone and degenerate elements with vectorized masks over the mesh buffers.
+    Returns (indices, coordinates, face_counts) of the elements in mesh order.
+    Islands are listed when they are under either enabled threshold; the
+    largest island is the mesh body and is never listed.
+    """
+    if element_type == 'ISLAND':
+        _labels, island_ids, face_counts, areas, centers = find_islands(buffers)
+        keep = np.ones(len(island_ids), dtype=bool)
+        if len(island_ids):
+            keep[np.argmax(face_counts)] = False
+        limits = []
+        if max_island_faces:
+            limits.append(face_counts <= max_island_faces)
+        if max_island_area:
+            limits.append(areas <= max_island_area)
+        if limits:
+            keep &= np.logical_or.reduce(limits)
+        return island_ids[keep], centers[keep], face_counts[keep]
+
+    coords = buffers['coords']
+    edge_verts = buffers['edge_verts']
+
+    if element_type == 'VERTEX':
+        # Vertices not used by any edge
+        indices = np.flatnonzero(np.bincount(edge_verts.ravel(), minlength=len(coords)) == 0)
+        return indices, coords[indices], np.zeros(len(indices), dtype=np.int64)
+
+    if element_type in {'ZERO_FACE', 'DUPLICATE_FACE'}:
+        if element_type == 'ZERO_FACE':
+            indices = np.flatnonzero(buffers['face_areas'] <= min_face_area)
+        else:
+            indices = find_duplicate_faces(buffers)
+        return indices, buffers['face_centers'][indices], np.ones(len(indices), dtype=np.int64)
+
+    edge_use = np.bincount(buffers['loop_edges'], minlength=len(edge_verts))
+    if element_type == 'EDGE':
+        # Edges not used by any face
+        indices = np.flatnonzero(edge_use == 0)
+    elif element_type == 'ZERO_EDGE':
+        lengths = np.linalg.norm(coords[edge_verts[:, 0]] - coords[edge_verts[:, 1]], axis=1)
+        indices = np.flatnonzero(lengths <= min_edge_length)
+    else:
+        # Non-manifold edges shared by more than two faces
+        indices = np.flatnonzero(edge_use > 2)
+    return indices, coords[edge_verts[indices]].mean(axis=1), edge_use[indices]
+
+# Number of list rows that exist as RNA items at a time
+_PAGE_SIZE = 50
+
+# Detection results per scene, kept as NumPy arrays outside RNA so large
+# lists neither bloat the .blend file nor slow down redraws
+_results = {}
+
+# Element types counted by the health scan, in report column order
+_HEALTH_TYPES = ('VERTEX', 'EDGE', 'ISLAND', 'ZERO_EDGE', 'ZERO_FACE', 'DUPLICATE_FACE', 'NON_MANIFOLD')
+
+def mesh_health(buffers, thresholds):
+    """Count every standalone and degenerate element type of one mesh, in _HEALTH_TYPES order"""
+    return tuple(
+        len(find_standalone_elements(buffers, element_type, *thresholds)[0])
+        for element_type in _HEALTH_TYPES
+    )
+
+# Row label prefix of each element type
+_ITEM_LABELS = {
+    'VERTEX': "Vertex",
+    'EDGE': "Edge",
+    'ISLAND': "Island",
+    'ZERO_EDGE': "Zero Edge",
+    'ZERO_FACE': "Zero Face",
+    'DUPLICATE_FACE': "Duplicate Face",
+    'NON_MANIFOLD': "Non-Manifold Edge",
+}
+
+# Short column labels of the health report
+_HEALTH_LABELS = {
+    'VERTEX': "V",
+    'EDGE': "E",
+    'ISLAND': "Isl",
+    'ZERO_EDGE': "ZE",
+    'ZERO_FACE': "ZF",
+    'DUPLICATE_FACE': "Dup",
+    'NON_MANIFOLD': "NM",
+}
+
+def get_results(scene):
+    """Return the stored detection results of a scene, if any"""
+    return _results.get(scene.name_full)
+
+def fill_page(props, results):
+    """Rebuild the RNA rows of the current page from the stored results"""
+    props.element_list.clear()
+    if results is None:
+        props.page = 0
+        return
+
+    count = len(results['indices'])
+    props.page = min(props.page, max(0, (count - 1) // _PAGE_SIZE))
+    start = props.page * _PAGE_SIZE
+    end = min(start + _PAGE_SIZE, count)
+    label = _ITEM_LABELS[results['element_type']]
+
+    for position in range(start, end):
+        index = int(results['indices'][position])
+        item = props.element_list.add()
+        if results['element_type'] in {'ISLAND', 'NON_MANIFOLD'}:
+            item.item_name = f"{label} {index} ({results['face_counts'][position]} faces)"
+        else:
+            item.item_name = f"{label} {index}"
+        item.item_index = index
+        item.list_position = position
+        item.coordinates = results['coordinates'][position].tolist()
+        item.select = bool(results['selected'][position])
+
+# Health scan summaries per scene name: list of (object name, counts)
+_health_results = {}
+
+def fill_health_list(props, summaries):
+    """Rebuild the health report rows, sorted by the chosen key"""
+    props.health_list.clear()
+    if not summaries:
+        return
+
+    if props.health_sort == 'PROBLEMS':
+        ordered = sorted(summaries, key=lambda summary: (-sum(summary[1]), summary[0]))
+    else:
+        ordered = sorted(summaries, key=lambda summary: summary[0])
+
+    for object_name, counts in ordered:
+        item = props.health_list.add()
+        item.object_name = object_name
+        item.counts = counts
+        item.total = sum(counts)
+
+def update_health_sort(self, context):
+    summaries = _health_results.get(context.scene.name_full)
+    if summaries is None:
+        # Rows restored from a file or undo step carry their own counts
+        summaries = [(item.object_name, tuple(item.counts)) for item in self.health_list]
+    fill_health_list(self, summaries)
+
+@persistent
+def reset_results(*args):
+    """
+    Stored results do not survive file loads and undo, drop them together
+    with the element rows that point into them
+    """
+    _results.clear()
+    _health_results.clear()
+    for scene in bpy.data.scenes:
+        props = getattr(scene, "standalone_tool_props", None)
+        if props is not None and len(props.element_list):
+            fill_page(props, None)
+
+def update_item_select(self, context):
+    """Mirror a row's checkbox into the stored selection and its cached counter"""
+    results = get_results(context.scene)
+    if results is None or self.list_position >= len(results['selected']):
+        return
+    if results['selected'][self.list_position] != self.select:
+        results['selected'][self.list_position] = self.select
+        results['selected_count'] += 1 if self.select else -1
 
 class StandaloneElementProperty(PropertyGroup):
     item_name: StringProperty(name="Item Name") # type: ignore
     item_index: IntProperty() # type: ignore
-    select: BoolProperty(name="Select", default=False) # type: ignore
+    list_position: IntProperty() # type: ignore
+    select: BoolProperty(name="Select", default=False, update=update_item_select) # type: ignore
     coordinates: FloatVectorProperty(name="Coordinates", size=3) # type: ignore
 
+class MeshHealthProperty(PropertyGroup):
+    object_name: StringProperty(name="Object") # type: ignore
+    counts: IntVectorProperty(name="Counts", size=len(_HEALTH_TYPES)) # type: ignore
+    total: IntProperty(name="Problems") # type: ignore
+
 class StandaloneToolsProperties(PropertyGroup):
     element_type: EnumProperty(
         name="Element Type",
@@ -16,12 +276,69 @@ class StandaloneToolsProperties(PropertyGroup):
         items=[
             ('VERTEX', "Vertex", "Isolated vertex"),
             ('EDGE', "Edge", "Isolated edge"),
-            ('FACE', "Face", "Isolated face"),
+            ('ISLAND', "Island", "Loose mesh island"),
+            ('ZERO_EDGE', "Zero-Length Edge", "Edge shorter than the edge tolerance"),
+            ('ZERO_FACE', "Zero-Area Face", "Face smaller than the area tolerance"),
+            ('DUPLICATE_FACE', "Duplicate Face", "Face using the same vertices as another face"),
+            ('NON_MANIFOLD', "Non-Manifold Edge (3+ Faces)", "Edge shared by more than two faces, boundary and wire edges are not included. Only selected in the mesh, never deleted"),
         ],
         default='VERTEX'
     ) # type: ignore
+    island_max_faces: IntProperty(
+        name="Max Faces",
+        description="List islands with at most this many faces (0 = no limit)",
+        default=10,
+        min=0
+    ) # type: ignore
+    island_max_area: FloatProperty(
+        name="Max Area",
+        description="List islands with at most this surface area (0 = no limit)",
+        default=0.0,
+        min=0.0,
+        subtype='AREA'
+    ) # type: ignore
+    min_edge_length: FloatProperty(
+        name="Edge Tolerance",
+        description="Edges at most this long are zero-length",
+        default=1e-5,
+        min=0.0,
+        precision=6,
+        subtype='DISTANCE'
+    ) # type: ignore
+    min_face_area: FloatProperty(
+        name="Area Tolerance",
+        description="Faces with at most this area are zero-area",
+        default=1e-8,
+        min=0.0,
+        precision=8,
+        subtype='AREA'
+    ) # type: ignore
     element_list: CollectionProperty(type=StandaloneElementProperty) # type: ignore
     element_list_index: IntProperty() # type: ignore
+    page: IntProperty(name="Page", min=0) # type: ignore
+    scan_collection: PointerProperty(
+        name="Collection",
+        description="Collection whose mesh objects are scanned",
+        type=bpy.types.Collection
+    ) # type: ignore
+    worker_count: IntProperty(
+        name="Worker Threads",
+        description="Number of threads used for the health scan (0 = automatic)",
+        default=0,
+        min=0,
+        max=64
+    ) # type: ignore
+    health_sort: EnumProperty(
+        name="Sort By",
+        items=[
+            ('PROBLEMS', "Problems", "Objects with the most problems first"),
+            ('NAME', "Name", "Alphabetical order"),
+        ],
+        default='PROBLEMS',
+        update=update_health_sort
+    ) # type: ignore
+    health_list: CollectionProperty(type=MeshHealthProperty) # type: ignore
+    health_list_index: IntProperty() # type: ignore
 
 class LIST_OT_PopulateElements(Operator):
     bl_idname = "object.populate_elements"
@@ -36,42 +353,46 @@ class LIST_OT_PopulateElements(Operator):
             return {'CANCELLED'}
 
         props = context.scene.standalone_tool_props
-        props.element_list.clear()
-
-        # Switch to edit mode temporarily
-        bpy.ops.object.mode_set(mode='EDIT')
-        me = obj.data
-        bm = bmesh.from_edit_mesh(me)
-
-        if props.element_type == 'VERTEX':
-            elements = [v for v in bm.verts if not v.link_edges]
-            for i, v in enumerate(elements):
-                item = props.element_list.add()
-                item.item_name = f"Vertex {i}"
-                item.item_index = i
-                item.coordinates = v.co.copy()
-
-        elif props.element_type == 'EDGE':
-            elements = [e for e in bm.edges if not e.link_faces]
-            for i, e in enumerate(elements):
-                item = props.element_list.add()
-                item.item_name = f"Edge {i}"
-                item.item_index = i
-                item.coordinates = e.verts[0].co.lerp(e.verts[1].co, 0.5)
-
-        elif props.element_type == 'FACE':
-            elements = [f for f in bm.faces if all(not e.link_faces for e in f.edges if e not in f.edges)]
-            for i, f in enumerate(elements):
-                item = props.element_list.add()
-                item.item_name = f"Face {i}"
-                item.item_index = i
-                item.coordinates = f.calc_center_median()
-
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-        self.report({'INFO'}, f"Found {len(props.element_list)} standalone {props.element_type.lower()}(s)")
+
+        # Read the mesh buffers directly, no mode switch needed
+        me = read_object_mesh(obj)
+        buffers = read_mesh_buffers(me)
+        indices, coordinates, face_counts = find_standalone_elements(
+            buffers, props.element_type,
+            props.island_max_faces, props.island_max_area,
+            props.min_edge_length, props.min_face_area
+        )
+
+        # Indices are real mesh indices (the smallest vertex index for islands)
+        results = {
+            'element_type': props.element_type,
+            'revision': mesh_revision(me, buffers),
+            'indices': indices,
+            'coordinates': coordinates,
+            'face_counts': face_counts,
+            'selected': np.zeros(len(indices), dtype=bool),
+            'selected_count': 0,
+        }
+        _results[context.scene.name_full] = results
+        props.page = 0
+        fill_page(props, results)
+
+        self.report({'INFO'}, f"Found {len(indices)} standalone {props.element_type.lower()}(s)")
         return {'FINISHED'}
 
+# Element sequence and bmesh delete context used to remove each element type,
+# None collapses the elements, 'DEGENERATE' dissolves faces through their edges
+# and 'SELECT' only selects them for a manual fix
+_DELETE_TARGETS = {
+    'VERTEX': ('verts', 'VERTS'),
+    'EDGE': ('edges', 'EDGES'),
+    'ISLAND': ('verts', 'VERTS'),
+    'ZERO_EDGE': ('edges', None),
+    'ZERO_FACE': ('faces', 'DEGENERATE'),
+    'DUPLICATE_FACE': ('faces', 'FACES_ONLY'),
+    'NON_MANIFOLD': ('edges', 'SELECT'),
+}
+
 class LIST_OT_ClearStandaloneElements(Operator):
     bl_idname = "object.clear_standalone_elements"
     bl_label = "Clear Selected Elements"
@@ -85,54 +406,73 @@ class LIST_OT_ClearStandaloneElements(Operator):
             return {'CANCELLED'}
 
         props = context.scene.standalone_tool_props
-        selected_items = [item for item in props.element_list if item.select]
+        results = get_results(context.scene)
         
-        if not selected_items:
+        if results is None or not results['selected_count']:
             self.report({'WARNING'}, "No elements selected")
             return {'CANCELLED'}
 
-        # Switch to edit mode
-        bpy.ops.object.mode_set(mode='EDIT')
-        me = obj.data
-        bm = bmesh.from_edit_mesh(me)
-
-        # Ensure all elements are deselected first
-        for v in bm.verts:
-            v.select = False
-        for e in bm.edges:
-            e.select = False
-        for f in bm.faces:
-            f.select = False
-
-        if props.element_type == 'VERTEX':
-            elements = [v for v in bm.verts if not v.link_edges]
-            for item in selected_items:
-                if item.item_index < len(elements):
-                    elements[item.item_index].select = True
-
-        elif props.element_type == 'EDGE':
-            elements = [e for e in bm.edges if not e.link_faces]
-            for item in selected_items:
-                if item.item_index < len(elements):
-                    elements[item.item_index].select = True
-
-        elif props.element_type == 'FACE':
-            elements = [f for f in bm.faces if all(not e.link_faces for e in f.edges if e not in f.edges)]
-            for item in selected_items:
-                if item.item_index < len(elements):
-                    elements[item.item_index].select = True
-
-        # Delete selected elements
-        bpy.ops.mesh.delete()
+        # Listed indices are only valid for the mesh revision they were found in
+        me = read_object_mesh(obj)
+        buffers = read_mesh_buffers(me)
+        if mesh_revision(me, buffers) != results['revision']:
+            self.report({'ERROR'}, "Element list is out of date, populate it again")
+            return {'CANCELLED'}
+
+        element_type = results['element_type']
+        indices = results['indices'][results['selected']]
+        removed_count = len(indices)
+
+        # Islands are removed through all of their vertices
+        if element_type == 'ISLAND':
+            vertex_labels = find_islands(buffers)[0]
+            indices = np.flatnonzero(np.isin(vertex_labels, indices))
+
+        if obj.mode == 'EDIT':
+            bm = bmesh.from_edit_mesh(me)
+        else:
+            bm = bmesh.new()
+            bm.from_mesh(me)
+
+        sequence_name, delete_context = _DELETE_TARGETS[element_type]
+        sequence = getattr(bm, sequence_name)
+        sequence.ensure_lookup_table()
+        geom = [sequence[index] for index in indices.tolist()]
+
+        # Remove all targets in one operation, zero-length edges are collapsed
+        if delete_context is None:
+            bmesh.ops.collapse(bm, edges=geom)
+        elif delete_context == 'DEGENERATE':
+            # Deleting a zero-area face would open a hole, collapse it into its neighbors instead
+            edges = list({edge for face in geom for edge in face.edges})
+            bmesh.ops.dissolve_degenerate(bm, dist=props.min_edge_length, edges=edges)
+        elif delete_context == 'SELECT':
+            # Deleting an edge shared by 3+ faces would tear a hole, leave the fix to the user
+            for element in (*bm.verts, *bm.edges, *bm.faces):
+                element.select = False
+            for element in geom:
+                element.select = True
+            bm.select_flush_mode()
+        else:
+            bmesh.ops.delete(bm, geom=geom, context=delete_context)
 
         # Update the mesh
-        bmesh.update_edit_mesh(me)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        if obj.mode == 'EDIT':
+            bmesh.update_edit_mesh(me)
+        else:
+            bm.to_mesh(me)
+            bm.free()
+            me.update()
+
+        if delete_context == 'SELECT':
+            self.report({'INFO'}, f"Selected {removed_count} {element_type.lower()}(s) in the mesh")
+            return {'FINISHED'}
 
         # Clear the list
-        props.element_list.clear()
+        _results.pop(context.scene.name_full, None)
+        fill_page(props, None)
 
-        self.report({'INFO'}, f"Removed {len(selected_items)} {props.element_type.lower()}(s)")
+        self.report({'INFO'}, f"Removed {removed_count} {element_type.lower()}(s)")
         return {'FINISHED'}
 
 class LIST_OT_SelectAll(Operator):
@@ -142,8 +482,11 @@ class LIST_OT_SelectAll(Operator):
 
     def execute(self, context):
         props = context.scene.standalone_tool_props
-        for item in props.element_list:
-            item.select = True
+        results = get_results(context.scene)
+        if results is not None:
+            results['selected'][:] = True
+            results['selected_count'] = len(results['selected'])
+            fill_page(props, results)
         return {'FINISHED'}
 
 class LIST_OT_SelectNone(Operator):
@@ -153,10 +496,76 @@ class LIST_OT_SelectNone(Operator):
 
     def execute(self, context):
         props = context.scene.standalone_tool_props
-        for item in props.element_list:
-            item.select = False
+        results = get_results(context.scene)
+        if results is not None:
+            results['selected'][:] = False
+            results['selected_count'] = 0
+            fill_page(props, results)
+        return {'FINISHED'}
+
+class LIST_OT_ChangeElementPage(Operator):
+    bl_idname = "object.change_element_page"
+    bl_label = "Change Elements Page"
+    bl_description = "Show another page of the elements list"
+
+    step: IntProperty(default=1) # type: ignore
+
+    def execute(self, context):
+        props = context.scene.standalone_tool_props
+        props.page = max(0, props.page + self.step)
+        fill_page(props, get_results(context.scene))
         return {'FINISHED'}
 
+class LIST_OT_ScanMeshHealth(Operator):
+    bl_idname = "object.scan_mesh_health"
+    bl_label = "Scan Mesh Health"
+    bl_description = "Count standalone and degenerate elements of every mesh in a collection"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        props = context.scene.standalone_tool_props
+        collection = props.scan_collection
+        if not collection:
+            self.report({'WARNING'}, "Select a collection to scan")
+            return {'CANCELLED'}
+
+        objects = [obj for obj in collection.all_objects if obj.type == 'MESH']
+        if not objects:
+            self.report({'WARNING'}, "No mesh objects in the collection")
+            return {'CANCELLED'}
+
+        # Buffers are read on the main thread, shared meshes only once
+        buffers_by_mesh = {}
+        for obj in objects:
+            me = read_object_mesh(obj)
+            key = me.as_pointer()
+            if key not in buffers_by_mesh:
+                buffers_by_mesh[key] = read_mesh_buffers(me)
+
+        thresholds = (props.island_max_faces, props.island_max_area, props.min_edge_length, props.min_face_area)
+        keys = list(buffers_by_mesh)
+        with ThreadPoolExecutor(max_workers=props.worker_count or None) as pool:
+            counts = pool.map(lambda key: mesh_health(buffers_by_mesh[key], thresholds), keys)
+            counts_by_mesh = dict(zip(keys, counts))
+
+        summaries = [(obj.name, counts_by_mesh[obj.data.as_pointer()]) for obj in objects]
+        _health_results[context.scene.name_full] = summaries
+        fill_health_list(props, summaries)
+
+        problem_objects = sum(1 for _name, counts in summaries if any(counts))
+        self.report({'INFO'}, f"Scanned {len(objects)} objects, {problem_objects} with problems")
+        return {'FINISHED'}
+
+class UL_MeshHealthList(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row()
+        row.label(text=item.object_name, icon='ERROR' if item.total else 'CHECKMARK')
+        row.label(text=" ".join(
+            f"{_HEALTH_LABELS[element_type]}:{count}"
+            for element_type, count in zip(_HEALTH_TYPES, item.counts) if count
+        ))
+        row.label(text=str(item.total))
+
 class UL_StandaloneElementList(UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
         custom_icon = 'DOT'
@@ -167,15 +576,30 @@ class UL_StandaloneElementList(UIList):
 
 def draw_panel(context, layout):
     props = context.scene.standalone_tool_props
-
-    layout.prop(props, "element_type", expand=True)
+    results = get_results(context.scene)
+
+    layout.prop(props, "element_type")
+    if props.element_type == 'ISLAND':
+        row = layout.row(align=True)
+        row.prop(props, "island_max_faces")
+        row.prop(props, "island_max_area")
+    elif props.element_type == 'ZERO_EDGE':
+        layout.prop(props, "min_edge_length")
+    elif props.element_type == 'ZERO_FACE':
+        layout.prop(props, "min_face_area")
     layout.operator("object.populate_elements", text="Populate List")
     
     row = layout.row()
     row.template_list("UL_StandaloneElementList", "", props, "element_list", props, "element_list_index")
 
-    total_items = len(props.element_list)
-    selected_items = sum(1 for item in props.element_list if item.select)
+    total_items = len(results['indices']) if results else 0
+    selected_items = results['selected_count'] if results else 0
+    page_count = max(1, -(-total_items // _PAGE_SIZE))
+
+    row = layout.row(align=True)
+    row.operator("object.change_element_page", text="", icon='TRIA_LEFT').step = -1
+    row.label(text=f"Page {props.page + 1} / {page_count}")
+    row.operator("object.change_element_page", text="", icon='TRIA_RIGHT').step = 1
     
     box = layout.box()
     row = box.row()
@@ -185,24 +609,49 @@ def draw_panel(context, layout):
     row.operator("object.select_all_elements", text="Select All")
     row.operator("object.select_none_elements", text="Select None")
 
-    layout.operator("object.clear_standalone_elements", text="Clear Selected Elements")
+    if results and _DELETE_TARGETS[results['element_type']][1] == 'SELECT':
+        layout.operator("object.clear_standalone_elements", text="Select in Mesh")
+    else:
+        layout.operator("object.clear_standalone_elements", text="Clear Selected Elements")
+
+    # Collection health scan
+    box = layout.box()
+    box.label(text="Health Scan:")
+    box.prop_search(props, "scan_collection", bpy.data, "collections")
+    row = box.row(align=True)
+    row.prop(props, "worker_count")
+    row.prop(props, "health_sort", text="")
+    box.operator("object.scan_mesh_health", text="Scan Collection")
+    if props.health_list:
+        box.template_list("UL_MeshHealthList", "", props, "health_list", props, "health_list_index", rows=5)
 
 classes = (
     StandaloneElementProperty,
+    MeshHealthProperty,
     StandaloneToolsProperties,
     LIST_OT_PopulateElements,
     LIST_OT_ClearStandaloneElements,
     LIST_OT_SelectAll,
     LIST_OT_SelectNone,
+    LIST_OT_ChangeElementPage,
+    LIST_OT_ScanMeshHealth,
     UL_StandaloneElementList,
+    UL_MeshHealthList,
 )
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.standalone_tool_props = bpy.props.PointerProperty(type=StandaloneToolsProperties)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(reset_results)
 
 def unregister():
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if reset_results in handlers:
+            handlers.remove(reset_results)
+    _results.clear()
+    _health_results.clear()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.standalone_tool_props
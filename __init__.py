@@ -16,6 +16,7 @@ import os
 
 # تعریف نام‌های ماژول‌ها
 modulesNames = [
+    'utils',
     'AdvancedVertexMerge',
     'collection_scaler',    
     'Blender_rename',
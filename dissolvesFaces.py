@@ -1,9 +1,11 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import bpy
 import bmesh
-import mathutils
 import numpy as np
 from bpy.types import Operator, Panel, AddonPreferences
-from bpy.props import FloatProperty, BoolProperty, IntProperty, StringProperty
+from bpy.props import FloatProperty, BoolProperty, IntProperty, StringProperty, EnumProperty
+from .utils import connected_labels, cluster_groups
 
 bl_info = {
     "name": "Z-Tools: Neighborhood Face Dissolve",
@@ -17,6 +19,295 @@ bl_info = {
     "category": "Mesh",
 }
 
+def build_face_adjacency(mesh):
+    """
+    Build a face adjacency index from the edge indices of the mesh loops.
+    Returns the (a, b, edge) arrays of every pair of faces sharing an edge, with a < b.
+    """
+    face_count = len(mesh.polygons)
+    loop_totals = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    loop_faces = np.repeat(np.arange(face_count, dtype=np.int64), loop_totals)
+
+    # Loops sharing an edge end up next to each other once sorted by edge
+    order = np.argsort(loop_edges, kind='stable')
+    sorted_edges = loop_edges[order]
+    sorted_faces = loop_faces[order]
+
+    pairs_a, pairs_b, pair_edges = [], [], []
+    shift = 1
+    while shift < len(order):
+        same_edge = sorted_edges[shift:] == sorted_edges[:-shift]
+        if not same_edge.any():
+            break
+        pairs_a.append(sorted_faces[:-shift][same_edge])
+        pairs_b.append(sorted_faces[shift:][same_edge])
+        pair_edges.append(sorted_edges[shift:][same_edge])
+        shift += 1
+
+    if pairs_a:
+        a = np.concatenate(pairs_a)
+        b = np.concatenate(pairs_b)
+        edges = np.concatenate(pair_edges).astype(np.int64)
+    else:
+        a = b = edges = np.empty(0, dtype=np.int64)
+
+    # Drop faces that use an edge twice and orient every pair as a < b
+    distinct = a != b
+    a, b, edges = a[distinct], b[distinct], edges[distinct]
+    a, b = np.minimum(a, b), np.maximum(a, b)
+    return a, b, edges
+
+def read_face_normals_areas(mesh):
+    """Read all face normals, areas and centers of a mesh with foreach_get"""
+    face_count = len(mesh.polygons)
+    normals = np.empty(face_count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+    areas = np.empty(face_count, dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+    centers = np.empty(face_count * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("center", centers)
+    return normals.reshape(face_count, 3), areas, centers.reshape(face_count, 3)
+
+def is_coplanar(region_normals, cos_threshold):
+    """
+    Check if all faces of a region are coplanar
+    Uses average normal and checks deviation
+    """
+    if not len(region_normals):
+        return False
+
+    avg_normal = region_normals.mean(axis=0)
+    length = np.linalg.norm(avg_normal)
+    if length == 0:
+        return False
+
+    # Every face normal must stay within the threshold angle of the average
+    return bool(np.all(region_normals @ (avg_normal / length) >= cos_threshold))
+
+def read_mesh_geometry(mesh):
+    """Read vertex positions, loop vertices and face sizes of a mesh with foreach_get"""
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return coords.reshape(-1, 3), loop_verts, loop_totals
+
+# Face analysis per mesh data pointer, validated against the mesh revision hash
+_analysis_cache = {}
+_ANALYSIS_CACHE_SIZE = 4
+
+def analyze_faces(mesh):
+    """
+    Build the adjacent face pairs, face normals and the cosine of every
+    neighbor-normal angle of a mesh. The result is cached, so changing
+    only the thresholds reuses it and just redoes the region thresholding.
+    """
+    key = mesh.as_pointer()
+
+    # Hash of the vertex positions and face topology, validating the cached analysis
+    coords, loop_verts, loop_totals = read_mesh_geometry(mesh)
+    revision = hash((coords.tobytes(), loop_verts.tobytes(), loop_totals.tobytes()))
+    analysis = _analysis_cache.get(key)
+    if analysis is not None and analysis['revision'] == revision:
+        return analysis
+
+    pairs_a, pairs_b, pair_edges = build_face_adjacency(mesh)
+    normals, areas, centers = read_face_normals_areas(mesh)
+    valid_faces = (areas > 0) & (np.linalg.norm(normals, axis=1) > 0)
+
+    # Pairs touching a degenerate face get a cosine no threshold can reach
+    pair_cos = np.einsum('ij,ij->i', normals[pairs_a], normals[pairs_b])
+    pair_cos[~(valid_faces[pairs_a] & valid_faces[pairs_b])] = -2.0
+
+    analysis = {
+        'revision': revision,
+        'normals': normals,
+        'centers': centers,
+        'pairs_a': pairs_a,
+        'pairs_b': pairs_b,
+        'pair_edges': pair_edges,
+        'pair_cos': pair_cos,
+        'coords': coords,
+        'loop_verts': loop_verts,
+        'loop_indptr': np.concatenate([[0], np.cumsum(loop_totals, dtype=np.int64)]),
+    }
+    _analysis_cache.pop(key, None)
+    _analysis_cache[key] = analysis
+    for stale_key in list(_analysis_cache)[:-_ANALYSIS_CACHE_SIZE]:
+        _analysis_cache.pop(stale_key, None)
+    return analysis
+
+def face_vertices(analysis, faces):
+    """Unique vertex indices used by `faces`"""
+    indptr = analysis['loop_indptr']
+    starts = indptr[faces]
+    counts = indptr[faces + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return np.unique(analysis['loop_verts'][offsets + np.arange(int(counts.sum()))])
+
+def region_plane_error(analysis, region):
+    """Largest distance of the region's vertices to their least-squares plane"""
+    points = analysis['coords'][face_vertices(analysis, region)].astype(np.float64)
+    centered = points - points.mean(axis=0)
+    # The plane normal is the direction of least variance
+    _values, vectors = np.linalg.eigh(centered.T @ centered)
+    return float(np.abs(centered @ vectors[:, 0]).max())
+
+def connected_subsets(faces, pairs_a, pairs_b):
+    """Connected parts of the sorted face set `faces`, given the pairs inside it"""
+    local = connected_labels(
+        len(faces), np.searchsorted(faces, pairs_a), np.searchsorted(faces, pairs_b)
+    )
+    return [faces[group] for group in cluster_groups(local)]
+
+def split_region(analysis, region, pairs_a, pairs_b):
+    """
+    Bisect a region at the median of its face centers along their widest
+    axis. Returns (faces, pairs_a, pairs_b) for every connected part of each half.
+    """
+    centers = analysis['centers'][region].astype(np.float64)
+    centered = centers - centers.mean(axis=0)
+    _values, vectors = np.linalg.eigh(centered.T @ centered)
+    projection = centered @ vectors[:, -1]
+    lower = projection <= np.median(projection)
+    if lower.all() or not lower.any():
+        return []
+
+    parts = []
+    for half in (region[lower], region[~lower]):
+        inside = np.isin(pairs_a, half) & np.isin(pairs_b, half)
+        half_a, half_b = pairs_a[inside], pairs_b[inside]
+        for part in connected_subsets(half, half_a, half_b):
+            within = np.isin(half_a, part)
+            parts.append((part, half_a[within], half_b[within]))
+    return parts
+
+# Validating and bisecting regions is the per-region work worth threading,
+# and only when there are enough candidate regions to spread over the workers
+_PARALLEL_MIN_REGIONS = 256
+
+def split_failing_regions(analysis, labels, pairs_a, pairs_b, min_region_size, region_fits, worker_count=1):
+    """
+    Turn candidate regions into regions that pass `region_fits`, bisecting
+    the ones that fail until their parts pass or get too small. Every round
+    checks and splits all pending regions, in a thread pool when there are many.
+    `region_fits(region)` returns (passes, error).
+    Returns (regions, largest error of the kept regions).
+    """
+    # Hand every candidate region its own pairs
+    pair_order = np.argsort(labels[pairs_a], kind='stable')
+    pairs_a, pairs_b = pairs_a[pair_order], pairs_b[pair_order]
+    pair_labels = labels[pairs_a]
+
+    pending = []
+    for region in cluster_groups(labels):
+        if len(region) >= min_region_size:
+            start, end = np.searchsorted(pair_labels, [labels[region[0]], labels[region[0]] + 1])
+            pending.append((region, pairs_a[start:end], pairs_b[start:end]))
+
+    def check(part):
+        region, region_a, region_b = part
+        passes, error = region_fits(region)
+        if passes:
+            return region, error, []
+        parts = split_region(analysis, region, region_a, region_b)
+        return None, error, [part for part in parts if len(part[0]) >= min_region_size]
+
+    regions = []
+    largest_error = 0.0
+    pool = ThreadPoolExecutor(max_workers=worker_count) if worker_count > 1 else None
+    try:
+        while pending:
+            if pool is not None and len(pending) >= _PARALLEL_MIN_REGIONS:
+                results = list(pool.map(check, pending))
+            else:
+                results = [check(part) for part in pending]
+
+            pending = []
+            for region, error, parts in results:
+                if region is not None:
+                    regions.append(region)
+                    largest_error = max(largest_error, error)
+                pending.extend(parts)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    regions.sort(key=lambda region: region[0])
+    return regions, largest_error
+
+def boundary_pair_mask(mesh, analysis, keep_materials, keep_seams, keep_sharp, keep_selection):
+    """
+    Mask of adjacent face pairs separated by a boundary that must be kept.
+    Every boundary is read once as a flat array and applied to all pairs at once.
+    """
+    pairs_a = analysis['pairs_a']
+    pairs_b = analysis['pairs_b']
+    blocked = np.zeros(len(pairs_a), dtype=bool)
+    face_count = len(mesh.polygons)
+
+    if keep_materials:
+        material_indices = np.empty(face_count, dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", material_indices)
+        blocked |= material_indices[pairs_a] != material_indices[pairs_b]
+
+    if keep_selection:
+        selected = np.empty(face_count, dtype=bool)
+        mesh.polygons.foreach_get("select", selected)
+        blocked |= selected[pairs_a] != selected[pairs_b]
+
+    edge_mask = np.zeros(len(mesh.edges), dtype=bool)
+    for keep, attribute in ((keep_seams, "use_seam"), (keep_sharp, "use_edge_sharp")):
+        if keep:
+            flags = np.empty(len(mesh.edges), dtype=bool)
+            mesh.edges.foreach_get(attribute, flags)
+            edge_mask |= flags
+    blocked |= edge_mask[analysis['pair_edges']]
+
+    return blocked
+
+def detect_coplanar_regions(analysis, cos_threshold, min_region_size, worker_count=1,
+                            blocked=None, max_plane_error=None):
+    """
+    Grow coplanar regions with union-find over adjacent face pairs whose
+    normals are within the threshold angle and that are not `blocked` by a
+    kept boundary. Regions that are too small are dropped. Without
+    `max_plane_error`, regions whose faces drift away from the region's
+    average normal are split until every part stays within the threshold;
+    with it, regions are split until they fit a plane within that distance.
+    Returns (regions, largest plane error or None); regions are face index
+    arrays and do not depend on face order.
+    """
+    normals = analysis['normals']
+    joined = analysis['pair_cos'] >= cos_threshold
+    if blocked is not None:
+        joined &= ~blocked
+    pairs_a = analysis['pairs_a'][joined]
+    pairs_b = analysis['pairs_b'][joined]
+
+    labels = connected_labels(len(normals), pairs_a, pairs_b)
+
+    if max_plane_error is not None:
+        def region_fits(region):
+            error = region_plane_error(analysis, region)
+            return error <= max_plane_error, error
+
+        return split_failing_regions(
+            analysis, labels, pairs_a, pairs_b, min_region_size, region_fits, worker_count
+        )
+
+    # Chained pairs can drift past the threshold, split those regions instead of dropping them
+    regions, _error = split_failing_regions(
+        analysis, labels, pairs_a, pairs_b, min_region_size,
+        lambda region: (is_coplanar(normals[region], cos_threshold), 0.0), worker_count
+    )
+    return regions, None
+
 class ZTOOLS_OT_Dissolve_Neighborhood_Faces(Operator):
     """Dissolve faces based on neighborhood coplanarity"""
     bl_idname = "ztools.dissolve_neighborhood_faces"
@@ -32,22 +323,65 @@ class ZTOOLS_OT_Dissolve_Neighborhood_Faces(Operator):
         subtype='ANGLE'
     )
 
-    neighborhood_depth: IntProperty(
-        name="Neighborhood Depth",
-        description="Depth of face neighborhood to check",
-        default=2,
-        min=1,
-        max=5
+    dissolve_mode: EnumProperty(
+        name="Mode",
+        description="How coplanar regions are validated",
+        items=[
+            ('ANGLE', "Angle", "Every face normal must stay within the angle threshold of the region average"),
+            ('PLANE_ERROR', "Plane Error", "Every vertex must stay within a distance of the region's least-squares plane"),
+        ],
+        default='ANGLE'
+    )
+
+    max_plane_error: FloatProperty(
+        name="Max Plane Error",
+        description="Largest allowed distance of a region vertex to the fitted plane",
+        default=0.001,
+        min=0.0,
+        precision=5,
+        subtype='DISTANCE'
     )
 
     min_neighborhood_size: IntProperty(
         name="Min Neighborhood Size",
-        description="Minimum number of faces in neighborhood to consider dissolution",
+        description="Minimum number of faces in a coplanar region to consider dissolution",
         default=3,
         min=2,
         max=10
     )
 
+    keep_material_boundaries: BoolProperty(
+        name="Keep Material Boundaries",
+        description="Do not dissolve across faces with different materials",
+        default=False
+    )
+
+    keep_seams: BoolProperty(
+        name="Keep UV Seams",
+        description="Do not dissolve across UV seam edges",
+        default=False
+    )
+
+    keep_sharp_edges: BoolProperty(
+        name="Keep Sharp Edges",
+        description="Do not dissolve across edges marked sharp",
+        default=False
+    )
+
+    keep_selection_boundaries: BoolProperty(
+        name="Keep Selection Boundaries",
+        description="Do not dissolve across the border between selected and unselected faces",
+        default=False
+    )
+
+    worker_count: IntProperty(
+        name="Worker Threads",
+        description="Threads used to check and split regions when there are many (0 = automatic, 1 = serial)",
+        default=1,
+        min=0,
+        max=64
+    )
+
     @classmethod
     def poll(cls, context):
         return (context.active_object is not None and 
@@ -58,113 +392,56 @@ class ZTOOLS_OT_Dissolve_Neighborhood_Faces(Operator):
         obj = context.active_object
         total_dissolved_faces = 0
 
-        # Convert angle to radians
-        angle_radians = np.radians(self.angle_threshold)
+        # Convert angle to a cosine so the coplanarity test is a dot product
+        cos_threshold = np.cos(np.radians(self.angle_threshold))
+
+        # Reuse the adjacency index and normals while the mesh is unchanged
+        obj.update_from_editmode()
+        analysis = analyze_faces(obj.data)
+
+        blocked = boundary_pair_mask(
+            obj.data, analysis,
+            self.keep_material_boundaries, self.keep_seams,
+            self.keep_sharp_edges, self.keep_selection_boundaries
+        )
+
+        # Phase 1: detect every region before the mesh is modified
+        worker_count = self.worker_count or os.cpu_count() or 1
+        max_plane_error = self.max_plane_error if self.dissolve_mode == 'PLANE_ERROR' else None
+        regions, largest_error = detect_coplanar_regions(
+            analysis, cos_threshold, self.min_neighborhood_size, worker_count, blocked, max_plane_error
+        )
 
-        # Create bmesh
+        # Phase 2: dissolve the detected regions, its face order matches the mesh polygons
         bm = bmesh.from_edit_mesh(obj.data)
         bm.faces.ensure_lookup_table()
+        faces = list(bm.faces)
+        faces_before = len(faces)
 
-        # Track processed faces to avoid repeated processing
-        processed_faces = set()
-
-        # Iterate through all faces
-        for base_face in bm.faces:
-            if base_face in processed_faces:
-                continue
-
-            # Get neighborhood of faces
-            neighborhood = self.get_face_neighborhood(base_face, self.neighborhood_depth)
-            
-            # Filter out invalid or already processed faces
-            valid_neighborhood = [
-                face for face in neighborhood 
-                if face not in processed_faces and 
-                face.calc_area() > 0 and 
-                face.normal.length > 0
-            ]
-
-            # Check if neighborhood meets minimum size
-            if len(valid_neighborhood) < self.min_neighborhood_size:
-                continue
-
-            # Check coplanarity of neighborhood
-            if self.is_neighborhood_coplanar(valid_neighborhood, angle_radians):
-                # Dissolve neighborhood faces
-                try:
-                    bmesh.ops.dissolve_faces(bm, faces=valid_neighborhood)
-                    total_dissolved_faces += len(valid_neighborhood)
-                    
-                    # Mark processed faces
-                    processed_faces.update(valid_neighborhood)
-                except Exception as e:
-                    self.report({'WARNING'}, f"Error dissolving neighborhood: {str(e)}")
+        for region in regions:
+            try:
+                bmesh.ops.dissolve_faces(bm, faces=[faces[i] for i in region.tolist()])
+                total_dissolved_faces += len(region)
+            except Exception as e:
+                self.report({'WARNING'}, f"Error dissolving region: {str(e)}")
 
         # Update mesh
         bmesh.update_edit_mesh(obj.data)
 
         # Report results
         if total_dissolved_faces > 0:
-            self.report({'INFO'}, f"Dissolved {total_dissolved_faces} faces in neighborhoods")
+            message = (
+                f"Dissolved {total_dissolved_faces} faces in {len(regions)} regions | "
+                f"Faces: {faces_before} -> {len(bm.faces)}"
+            )
+            if largest_error is not None:
+                message += f" | Max plane error: {largest_error:.6f}"
+            self.report({'INFO'}, message)
         else:
-            self.report({'INFO'}, "No suitable face neighborhoods found to dissolve")
+            self.report({'INFO'}, "No suitable coplanar regions found to dissolve")
         
         return {'FINISHED'}
 
-    def get_face_neighborhood(self, base_face, depth):
-        """
-        Recursively get face neighborhood up to specified depth
-        Uses a breadth-first search approach
-        """
-        neighborhood = {base_face}
-        frontier = {base_face}
-        
-        for _ in range(depth):
-            next_frontier = set()
-            for face in frontier:
-                # Get adjacent faces through edges
-                for edge in face.edges:
-                    for adj_face in edge.link_faces:
-                        if adj_face not in neighborhood:
-                            next_frontier.add(adj_face)
-                            neighborhood.add(adj_face)
-            
-            frontier = next_frontier
-            
-            # Stop if no new faces found
-            if not frontier:
-                break
-        
-        return list(neighborhood)
-
-    def is_neighborhood_coplanar(self, neighborhood, angle_threshold):
-        """
-        Check if all faces in neighborhood are coplanar
-        Uses average normal and checks deviation
-        """
-        if not neighborhood:
-            return False
-
-        # Calculate average normal using mathutils.Vector
-        avg_normal = mathutils.Vector(
-            np.mean([np.array(face.normal) for face in neighborhood], axis=0)
-        )
-
-        # Check each face's normal against average
-        for face in neighborhood:
-            try:
-                # Calculate angle between face normal and average normal
-                angle = abs(face.normal.angle(avg_normal))
-                
-                # Check if angle exceeds threshold
-                if angle > angle_threshold:
-                    return False
-            except Exception:
-                # Handle potential calculation errors
-                return False
-
-        return True
-
 def draw_panel(context, layout):    
     # Main operator button
     layout.operator("ztools.dissolve_neighborhood_faces", text="Dissolve Neighborhood Faces")
@@ -173,7 +450,6 @@ def draw_panel(context, layout):
     box = layout.box()
     box.label(text="Advanced Settings:")
     box.prop(context.scene, "ztools_angle_threshold")
-    box.prop(context.scene, "ztools_neighborhood_depth")
     box.prop(context.scene, "ztools_min_neighborhood_size")
 
 class ZTOOLS_AddonPreferences(AddonPreferences):
@@ -198,13 +474,6 @@ def register():
         max=180.0,
         subtype='ANGLE'
     )
-    bpy.types.Scene.ztools_neighborhood_depth = IntProperty(
-        name="Neighborhood Depth",
-        description="Depth of face neighborhood to check",
-        default=2,
-        min=1,
-        max=5
-    )
     bpy.types.Scene.ztools_min_neighborhood_size = IntProperty(
         name="Min Neighborhood Size",
         description="Minimum number of faces in neighborhood to dissolve",
@@ -216,7 +485,6 @@ def register():
 def unregister():
     # Unregister scene properties
     del bpy.types.Scene.ztools_min_neighborhood_size
-    del bpy.types.Scene.ztools_neighborhood_depth
     del bpy.types.Scene.ztools_angle_threshold
 
     # Unregister classes
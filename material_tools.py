@@ -1,12 +1,353 @@
+import hashlib
+import numpy as np
 import bpy
+import bmesh
+from bpy.app.handlers import persistent
 from bpy.types import Operator, Panel, PropertyGroup
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Reverse index of material usage, keyed by as_pointer() so renames keep entries valid
+_material_usage: Dict[int, Set[Tuple[int, int]]] = {}   # material -> {(mesh, slot)}
+_mesh_materials: Dict[int, Tuple[int, ...]] = {}        # mesh -> material per slot (0 = empty)
+_material_names: Dict[int, Tuple[str, str]] = {}        # material -> (name, lowercase name)
+_index_state = {'built': False, 'scope_key': None, 'scope': frozenset(), 'scope_data': []}
+
+# Faces per material slot of each mesh, dropped whenever the mesh is re-indexed
+_slot_face_counts: Dict[int, np.ndarray] = {}
+
+# Per-material update counters bumped by the depsgraph handler, and fingerprints cached against them
+_material_revisions: Dict[int, int] = {}
+_fingerprints: Dict[int, Tuple[int, str]] = {}
+
+# Lowercase names and usage counts of each scene's material list, used by filter_items.
+# Entries carry the list generation they were built for, bumped on every rebuild and reset
+_filter_arrays: Dict[str, Tuple[int, np.ndarray, np.ndarray]] = {}
+_filter_state = {'generation': 0}
+
+def index_mesh(mesh):
+    """Re-read the slots of one mesh and update the reverse index"""
+    mesh_key = mesh.as_pointer()
+    _slot_face_counts.pop(mesh_key, None)
+    for slot, material_key in enumerate(_mesh_materials.pop(mesh_key, ())):
+        if material_key:
+            _material_usage[material_key].discard((mesh_key, slot))
+
+    materials = tuple(mesh.materials)
+    _mesh_materials[mesh_key] = tuple(material.as_pointer() if material else 0 for material in materials)
+    for slot, material in enumerate(materials):
+        if material:
+            index_material(material)
+            _material_usage.setdefault(material.as_pointer(), set()).add((mesh_key, slot))
+
+def index_material(material):
+    _material_names[material.as_pointer()] = (material.name, material.name.lower())
+
+def ensure_usage_index():
+    """Build the reverse index from scratch when it is missing"""
+    if _index_state['built']:
+        return
+    clear_usage_index()
+    for material in bpy.data.materials:
+        index_material(material)
+    for mesh in bpy.data.meshes:
+        index_mesh(mesh)
+    _index_state['built'] = True
+
+def clear_usage_index():
+    _material_usage.clear()
+    _mesh_materials.clear()
+    _material_names.clear()
+    _slot_face_counts.clear()
+    _material_revisions.clear()
+    _fingerprints.clear()
+    _index_state.update(built=False, scope_key=None, scope=frozenset(), scope_data=[])
+
+@persistent
+def usage_index_update(scene, depsgraph):
+    """Only re-read the meshes and materials the depsgraph reports as changed"""
+    if not _index_state['built']:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Mesh):
+            index_mesh(id_data)
+        elif isinstance(id_data, bpy.types.Material):
+            index_material(id_data)
+            material_key = id_data.as_pointer()
+            _material_revisions[material_key] = _material_revisions.get(material_key, 0) + 1
+        elif isinstance(id_data, (bpy.types.Object, bpy.types.Collection)):
+            _index_state['scope_key'] = None
+
+@persistent
+def usage_index_reset(*args):
+    """Pointers do not survive file loads and undo, rebuild on next use"""
+    clear_usage_index()
+    _filter_arrays.clear()
+    _filter_state['generation'] += 1
+
+def scope_meshes(settings) -> frozenset:
+    """Pointers of the meshes in the object or collection scope, cached until objects change"""
+    if settings.selection_mode == 'OBJECT':
+        source = settings.selected_object
+    else:
+        source = settings.selected_collection
+    scope_key = (settings.selection_mode, source.as_pointer() if source else 0)
+    if _index_state['scope_key'] == scope_key:
+        return _index_state['scope']
 
+    objects = []
+    if settings.selection_mode == 'OBJECT':
+        if source:
+            objects = [source]
+    elif source:
+        objects = source.all_objects
+    meshes = unique_meshes(objects)
+
+    _index_state['scope_key'] = scope_key
+    _index_state['scope'] = frozenset(mesh.as_pointer() for mesh in meshes)
+    _index_state['scope_data'] = meshes
+    return _index_state['scope']
+
+def scope_mesh_data(settings) -> List[bpy.types.Mesh]:
+    """Mesh data of the current scope, deduplicated by pointer"""
+    scope_meshes(settings)
+    return _index_state['scope_data']
+
+def read_material_indices(mesh) -> np.ndarray:
+    """Face material indices, read from the edit BMesh when the mesh is in edit mode"""
+    if mesh.is_editmode:
+        bm = bmesh.from_edit_mesh(mesh)
+        return np.fromiter((face.material_index for face in bm.faces), dtype=np.int32, count=len(bm.faces))
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+    return material_indices
+
+def write_material_indices(mesh, material_indices):
+    """Write face material indices back to the edit BMesh or the mesh polygons"""
+    if mesh.is_editmode:
+        bm = bmesh.from_edit_mesh(mesh)
+        for face, material_index in zip(bm.faces, material_indices.tolist()):
+            face.material_index = material_index
+        bmesh.update_edit_mesh(mesh)
+    else:
+        mesh.polygons.foreach_set("material_index", material_indices)
+        mesh.update()
+
+def slot_face_counts(mesh) -> np.ndarray:
+    """Number of faces using each material slot, from one foreach_get and np.bincount"""
+    mesh_key = mesh.as_pointer()
+    counts = _slot_face_counts.get(mesh_key)
+    if counts is None:
+        slot_count = len(mesh.materials)
+        material_indices = read_material_indices(mesh)
+        if slot_count:
+            material_indices = np.clip(material_indices, 0, slot_count - 1)
+        counts = np.bincount(material_indices, minlength=slot_count)[:slot_count]
+        _slot_face_counts[mesh_key] = counts
+    return counts
+
+def material_filter_arrays(scene):
+    """Cached lowercase names and usage counts of the material list, checked against the list generation"""
+    items = scene.ztools_material_list
+    arrays = _filter_arrays.get(scene.name_full)
+    if arrays is None or arrays[0] != _filter_state['generation'] or len(arrays[1]) != len(items):
+        arrays = (
+            _filter_state['generation'],
+            np.array([item.name.lower() for item in items], dtype=str),
+            np.array([item.usage_count for item in items], dtype=np.int64),
+        )
+        _filter_arrays[scene.name_full] = arrays
+    return arrays[1], arrays[2]
+
+def visible_materials(scene, names=None) -> np.ndarray:
+    """Mask of the material list rows the search term keeps visible"""
+    settings = scene.ztools_material_tool_settings
+    if names is None:
+        names, _counts = material_filter_arrays(scene)
+    search_term = settings.search_term.lower()
+    if not search_term or not len(names):
+        return np.ones(len(names), dtype=bool)
+    if settings.match_mode == 'PREFIX':
+        return np.char.startswith(names, search_term)
+    return np.char.find(names, search_term) >= 0
+
+def unique_meshes(objects) -> List[bpy.types.Mesh]:
+    """Mesh data of the given mesh objects, deduplicated by pointer"""
+    meshes = {}
+    for obj in objects:
+        if obj.type == 'MESH':
+            meshes.setdefault(obj.data.as_pointer(), obj.data)
+    return list(meshes.values())
+
+def remove_material_slots(mesh, slots) -> int:
+    """
+    Remove material slots from a mesh and remap the face material indices
+    with a lookup table in one foreach_get/foreach_set pass.
+    Only the removed slots are popped, so object-linked slots of objects
+    sharing the mesh keep their assignment. Meshes in edit mode are remapped
+    through their edit BMesh, since object-mode data would be overwritten.
+    Faces of removed slots fall back to the first remaining slot.
+    """
+    slot_count = len(mesh.materials)
+    remove = np.zeros(slot_count, dtype=bool)
+    remove[[slot for slot in slots if 0 <= slot < slot_count]] = True
+    if not remove.any():
+        return 0
+
+    material_indices = read_material_indices(mesh)
+
+    # Old slot -> new slot, out-of-range indices are clamped like Blender does when drawing
+    lookup = np.cumsum(~remove, dtype=np.int32) - 1
+    lookup[remove] = 0
+    material_indices = lookup[np.clip(material_indices, 0, slot_count - 1)]
+
+    # Pop from the end so the remaining slot indices stay valid
+    for slot in np.flatnonzero(remove)[::-1].tolist():
+        mesh.materials.pop(index=slot)
+
+    write_material_indices(mesh, material_indices)
+
+    # The depsgraph handler runs after the operator, refresh the index now
+    _slot_face_counts.pop(mesh.as_pointer(), None)
+    if _index_state['built']:
+        index_mesh(mesh)
+    return int(remove.sum())
+
+# Node properties that never change how a material renders
+_IGNORED_NODE_PROPERTIES = {
+    'rna_type', 'name', 'label', 'location', 'width', 'width_hidden', 'height', 'dimensions',
+    'parent', 'select', 'show_options', 'show_preview', 'show_texture', 'hide', 'mute',
+    'use_custom_color', 'color', 'inputs', 'outputs', 'internal_links', 'type', 'bl_idname',
+    'bl_label', 'bl_description', 'bl_icon', 'bl_static_type', 'bl_width_default',
+    'bl_width_min', 'bl_width_max', 'bl_height_default', 'bl_height_min', 'bl_height_max',
+}
+
+# Material settings that change how a material renders, read with getattr since they vary by Blender version
+_MATERIAL_SETTINGS = (
+    'use_nodes', 'diffuse_color', 'metallic', 'roughness', 'specular_intensity', 'pass_index',
+    'blend_method', 'shadow_method', 'alpha_threshold', 'use_backface_culling',
+    'show_transparent_back', 'use_screen_refraction', 'refraction_depth', 'use_sss_translucency',
+    'surface_render_method', 'use_transparency_overlap', 'displacement_method',
+)
+
+# Deepest nesting of node structs walked before a value counts as not canonical
+_MAX_STRUCT_DEPTH = 6
+
+def canonical_value(value, depth=0):
+    """
+    Hashable, rounding-stable form of an RNA value.
+    Structs such as ColorRamp and CurveMapping are walked through their RNA properties,
+    so ramp elements and curve points are part of the value.
+    Raises ValueError when a value cannot be represented.
+    """
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if depth >= _MAX_STRUCT_DEPTH:
+        raise ValueError(f"{type(value).__name__} is nested too deeply")
+    if isinstance(value, bpy.types.bpy_struct):
+        return (value.bl_rna.identifier,) + tuple(
+            (prop.identifier, canonical_value(getattr(value, prop.identifier), depth + 1))
+            for prop in value.bl_rna.properties
+            if prop.identifier != 'rna_type'
+        )
+    try:
+        return tuple(canonical_value(item, depth + 1) for item in value)
+    except TypeError:
+        raise ValueError(f"{type(value).__name__} has no canonical form")
+
+def material_fingerprint(material) -> str:
+    """
+    Canonical hash of a material's settings and node tree: node types, node settings
+    (including ramps and curves), unlinked input values, image datablocks and links,
+    identified by structure so renamed nodes still match.
+    A material that cannot be canonicalised gets a fingerprint of its own, so it is never merged.
+    Cached per material until the depsgraph handler bumps its update counter.
+    """
+    material_key = material.as_pointer()
+    revision = _material_revisions.get(material_key, 0)
+    cached = _fingerprints.get(material_key)
+    if cached and cached[0] == revision:
+        return cached[1]
+
+    try:
+        parts = material_parts(material)
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    except ValueError:
+        digest = f"unique:{material_key:x}"
+    _fingerprints[material_key] = (revision, digest)
+    return digest
+
+def node_digests(tree) -> Dict[str, str]:
+    """
+    Structural digest of every node, independent of node names: its type,
+    settings and unlinked input values, plus the digests of the nodes feeding
+    each linked input. Node names are only used as lookup keys, never hashed.
+    Raises ValueError on a cyclic tree.
+    """
+    incoming: Dict[Tuple[str, str], List[Tuple[str, str, bool]]] = {}
+    for link in tree.links:
+        incoming.setdefault((link.to_node.name, link.to_socket.identifier), []).append(
+            (link.from_node.name, link.from_socket.identifier, link.is_muted)
+        )
+    nodes = {node.name: node for node in tree.nodes}
+    digests: Dict[str, str] = {}
+    visiting = set()
+
+    def digest(name):
+        if name in digests:
+            return digests[name]
+        if name in visiting:
+            raise ValueError("Node tree contains a cycle")
+        visiting.add(name)
+
+        node = nodes[name]
+        settings = tuple(
+            (prop.identifier, canonical_value(getattr(node, prop.identifier)))
+            for prop in node.bl_rna.properties
+            if prop.identifier not in _IGNORED_NODE_PROPERTIES
+        )
+        inputs = []
+        for socket in node.inputs:
+            links = incoming.get((name, socket.identifier))
+            if links:
+                inputs.append((socket.identifier, tuple(sorted(
+                    (digest(from_name), from_socket, muted) for from_name, from_socket, muted in links
+                ))))
+            else:
+                inputs.append((socket.identifier, canonical_value(getattr(socket, "default_value", None))))
+
+        visiting.discard(name)
+        digests[name] = hashlib.sha1(repr((node.bl_idname, node.mute, settings, tuple(inputs))).encode()).hexdigest()
+        return digests[name]
+
+    for name in nodes:
+        digest(name)
+    return digests
+
+def material_parts(material) -> list:
+    """Canonical dump of everything the fingerprint covers"""
+    parts = [
+        (name, canonical_value(getattr(material, name, None)))
+        for name in _MATERIAL_SETTINGS
+    ]
+    if material.use_nodes and material.node_tree:
+        # The sorted multiset of structural node digests covers the nodes and their links
+        parts.append(tuple(sorted(node_digests(material.node_tree).values())))
+    return parts
 
 class ZTOOLS_MT_MaterialListItem(PropertyGroup):
     name: bpy.props.StringProperty(name="Material Name")
     index: bpy.props.IntProperty(name="Material Index")
     selected: bpy.props.BoolProperty(name="Selected", default=False)
+    usage_count: bpy.props.IntProperty(name="Usage Count", description="Meshes in scope using this material")
+    face_count: bpy.props.IntProperty(name="Face Count", description="Faces in scope using this material")
 
 class ZTOOLS_PG_MaterialToolSettings(PropertyGroup):
     """Property group for material tool settings"""
@@ -31,45 +372,71 @@ class ZTOOLS_PG_MaterialToolSettings(PropertyGroup):
     ) # type: ignore
     search_term: bpy.props.StringProperty(
         name="Search Materials",
-        description="Filter materials by name",
-        update=lambda self, context: self.update_material_list(context)
+        description="Filter materials by name"
+    ) # type: ignore
+    match_mode: bpy.props.EnumProperty(
+        name="Match",
+        items=[
+            ('CONTAINS', "Contains", "Names containing the search term"),
+            ('PREFIX', "Prefix", "Names starting with the search term")
+        ],
+        default='CONTAINS'
+    ) # type: ignore
+    sort_mode: bpy.props.EnumProperty(
+        name="Sort By",
+        items=[
+            ('NAME', "Name", "Alphabetical order"),
+            ('USAGE', "Usage", "Most used materials first")
+        ],
+        default='NAME'
     ) # type: ignore
 
     def update_material_list(self, context):
         """
-        Automatically update material list when object or collection is selected
+        Automatically update material list when object or collection is selected.
+        The search term is applied by the list's filter_items, so typing never rebuilds it.
         """
-        # Clear previous materials list
-        context.scene.ztools_material_list.clear()
-
-        # Determine objects based on selection mode
-        objects_to_check: List[bpy.types.Object] = []
-        
-        if self.selection_mode == 'OBJECT':
-            obj = self.selected_object
-            if obj and obj.type == 'MESH':
-                objects_to_check = [obj]
-        
-        elif self.selection_mode == 'COLLECTION':
-            collection = self.selected_collection
-            if collection:
-                objects_to_check = [
-                    obj for obj in collection.all_objects 
-                    if obj.type == 'MESH'
-                ]
-
-        # Collect unique materials
-        unique_materials = set()
-        for obj in objects_to_check:
-            for idx, material in enumerate(obj.data.materials):
-                if material and material not in unique_materials:
-                    # Apply search filter
-                    if not self.search_term or self.search_term.lower() in material.name.lower():
-                        unique_materials.add(material)
-                        item = context.scene.ztools_material_list.add()
-                        item.name = material.name
-                        item.index = idx
-                        item.selected = False
+        material_list = context.scene.ztools_material_list
+        selected_names = {item.name for item in material_list if item.selected}
+        material_list.clear()
+
+        ensure_usage_index()
+        scope = scope_meshes(self)
+
+        # Faces per material summed over the slots of every mesh in scope
+        face_totals: Dict[int, int] = {}
+        for mesh in scope_mesh_data(self):
+            counts = slot_face_counts(mesh).tolist()
+            for slot, material_key in enumerate(_mesh_materials.get(mesh.as_pointer(), ())):
+                if material_key and slot < len(counts):
+                    face_totals[material_key] = face_totals.get(material_key, 0) + counts[slot]
+
+        # Every material used in scope with its first slot and mesh count
+        materials = []
+        for material_key, (name, lowercase_name) in _material_names.items():
+            usage = [(mesh_key, slot) for mesh_key, slot in _material_usage.get(material_key, ()) if mesh_key in scope]
+            if usage:
+                mesh_count = len({mesh_key for mesh_key, _slot in usage})
+                materials.append((
+                    name, lowercase_name, min(slot for _mesh_key, slot in usage),
+                    mesh_count, face_totals.get(material_key, 0)
+                ))
+        materials.sort()
+
+        for name, _lowercase_name, slot, mesh_count, face_count in materials:
+            item = material_list.add()
+            item.name = name
+            item.index = slot
+            item.usage_count = mesh_count
+            item.face_count = face_count
+            item.selected = name in selected_names
+
+        _filter_state['generation'] += 1
+        _filter_arrays[context.scene.name_full] = (
+            _filter_state['generation'],
+            np.array([material[1] for material in materials], dtype=str),
+            np.array([material[3] for material in materials], dtype=np.int64),
+        )
 
 class ZTOOLS_OT_MaterialClearer(Operator):
     """Clear selected materials from objects"""
@@ -102,35 +469,151 @@ class ZTOOLS_OT_MaterialClearer(Operator):
                 self.report({'WARNING'}, "Select a valid collection")
                 return {'CANCELLED'}
 
-        # Get materials to remove
+        # Get materials to remove, rows hidden by the search filter are left alone
+        visible = visible_materials(context.scene).tolist()
         materials_to_remove = [
-            item.name for item in context.scene.ztools_material_list 
-            if item.selected
+            item.name for item, shown in zip(context.scene.ztools_material_list, visible)
+            if item.selected and shown
         ]
+        hidden_selected = sum(
+            1 for item, shown in zip(context.scene.ztools_material_list, visible)
+            if item.selected and not shown
+        )
 
         if not materials_to_remove:
-            self.report({'WARNING'}, "No materials selected to clear")
+            if hidden_selected:
+                self.report({'WARNING'}, "Selected materials are hidden by the search filter")
+            else:
+                self.report({'WARNING'}, "No materials selected to clear")
             return {'CANCELLED'}
 
-        # Process materials for each object
+        # Remove the slots of every mesh in one pass, shared meshes only once
         cleared_count = 0
-        for obj in objects_to_process:
-            # Check if object has materials
-            if not obj.data.materials:
-                continue
-
-            # Remove selected materials
-            for material_name in materials_to_remove:
-                for idx, mat in enumerate(obj.data.materials):
-                    if mat and mat.name == material_name:
-                        obj.data.materials.pop(index=idx)
-                        cleared_count += 1
-                        break
+        names_to_remove = set(materials_to_remove)
+        for mesh in unique_meshes(objects_to_process):
+            slots = [
+                idx for idx, mat in enumerate(mesh.materials)
+                if mat and mat.name in names_to_remove
+            ]
+            cleared_count += remove_material_slots(mesh, slots)
 
         # Update material list automatically
         settings.update_material_list(context)
         
-        self.report({'INFO'}, f"Cleared {cleared_count} materials")
+        if hidden_selected:
+            self.report({'WARNING'}, f"Cleared {cleared_count} materials, skipped {hidden_selected} hidden by the search filter")
+        else:
+            self.report({'INFO'}, f"Cleared {cleared_count} materials")
+        return {'FINISHED'}
+
+class ZTOOLS_OT_MaterialUsageReport(Operator):
+    """Count the faces using each material slot in scope and report unused slots"""
+    bl_idname = "ztools.material_usage_report"
+    bl_label = "Material Usage Report"
+
+    def execute(self, context):
+        settings = context.scene.ztools_material_tool_settings
+        ensure_usage_index()
+        meshes = scope_mesh_data(settings)
+        if not meshes:
+            self.report({'WARNING'}, "No mesh objects in scope")
+            return {'CANCELLED'}
+
+        # Re-read the face counts, then refresh the list totals
+        unused_slots = 0
+        meshes_with_unused = 0
+        for mesh in meshes:
+            _slot_face_counts.pop(mesh.as_pointer(), None)
+            unused = int(np.count_nonzero(slot_face_counts(mesh) == 0))
+            unused_slots += unused
+            meshes_with_unused += bool(unused)
+        settings.update_material_list(context)
+
+        self.report(
+            {'INFO'},
+            f"{len(context.scene.ztools_material_list)} materials in {len(meshes)} meshes | "
+            f"Unused slots: {unused_slots} in {meshes_with_unused} meshes"
+        )
+        return {'FINISHED'}
+
+class ZTOOLS_OT_PurgeUnusedSlots(Operator):
+    """Remove material slots that no face uses from every mesh in scope"""
+    bl_idname = "ztools.purge_unused_slots"
+    bl_label = "Purge Unused Slots"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        settings = context.scene.ztools_material_tool_settings
+        ensure_usage_index()
+        meshes = scope_mesh_data(settings)
+        if not meshes:
+            self.report({'WARNING'}, "No mesh objects in scope")
+            return {'CANCELLED'}
+
+        purged_count = 0
+        for mesh in list(meshes):
+            unused = np.flatnonzero(slot_face_counts(mesh) == 0)
+            purged_count += remove_material_slots(mesh, unused.tolist())
+
+        settings.update_material_list(context)
+        self.report({'INFO'}, f"Purged {purged_count} unused slots")
+        return {'FINISHED'}
+
+class ZTOOLS_OT_DeduplicateMaterials(Operator):
+    """Replace identical materials in scope with a single survivor"""
+    bl_idname = "ztools.deduplicate_materials"
+    bl_label = "Deduplicate Materials"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        settings = context.scene.ztools_material_tool_settings
+        ensure_usage_index()
+        meshes = scope_mesh_data(settings)
+        if not meshes:
+            self.report({'WARNING'}, "No mesh objects in scope")
+            return {'CANCELLED'}
+
+        # Group the materials in scope by fingerprint
+        materials = {}
+        for mesh in meshes:
+            for material in mesh.materials:
+                if material:
+                    materials.setdefault(material.as_pointer(), material)
+        groups: Dict[str, List[bpy.types.Material]] = {}
+        for material in materials.values():
+            groups.setdefault(material_fingerprint(material), []).append(material)
+
+        # The shortest name survives, so "Mat" wins over "Mat.001"
+        replacements = {}
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            group.sort(key=lambda material: (len(material.name), material.name))
+            for duplicate in group[1:]:
+                replacements[duplicate.as_pointer()] = group[0]
+
+        if not replacements:
+            self.report({'INFO'}, "No duplicate materials found")
+            return {'FINISHED'}
+
+        # Remap every slot in one pass over the meshes in scope
+        remapped_slots = 0
+        for mesh in meshes:
+            changed = False
+            for slot, material in enumerate(mesh.materials):
+                survivor = replacements.get(material.as_pointer()) if material else None
+                if survivor:
+                    mesh.materials[slot] = survivor
+                    remapped_slots += 1
+                    changed = True
+            if changed:
+                index_mesh(mesh)
+
+        settings.update_material_list(context)
+        self.report(
+            {'INFO'},
+            f"Merged {len(replacements)} duplicate materials | Remapped slots: {remapped_slots}"
+        )
         return {'FINISHED'}
 
 class ZTOOLS_UL_MaterialList(bpy.types.UIList):
@@ -141,9 +624,28 @@ class ZTOOLS_UL_MaterialList(bpy.types.UIList):
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
             layout.prop(item, "selected", text="")
             layout.label(text=item.name, icon='MATERIAL')
+            layout.label(text=f"{item.face_count} faces / {item.usage_count}")
         elif self.layout_type in {'GRID'}:
             layout.prop(item, "selected", text="")
 
+    def filter_items(self, context, data, propname):
+        """Vectorized name mask and usage ordering over the precomputed arrays"""
+        items = getattr(data, propname)
+        settings = context.scene.ztools_material_tool_settings
+
+        names, counts = material_filter_arrays(context.scene)
+        flags = np.where(visible_materials(context.scene, names), self.bitflag_filter_item, 0).tolist()
+
+        # The list is stored in name order, only usage sorting needs a new order
+        order = []
+        if settings.sort_mode == 'USAGE' and len(items):
+            ranking = np.argsort(-counts, kind='stable')
+            new_order = np.empty(len(items), dtype=np.int64)
+            new_order[ranking] = np.arange(len(items))
+            order = new_order.tolist()
+
+        return flags, order
+
     def invoke(self, context, event):
         list_length = len(context.scene.ztools_material_list)
         current_index = context.scene.ztools_material_list_index
@@ -152,32 +654,38 @@ class ZTOOLS_UL_MaterialList(bpy.types.UIList):
             start_index = min(self.last_index, current_index)
             end_index = max(self.last_index, current_index)
             
+            visible = visible_materials(context.scene)
             for i in range(start_index, end_index + 1):
-                context.scene.ztools_material_list[i].selected = True
+                if visible[i]:
+                    context.scene.ztools_material_list[i].selected = True
 
         self.last_index = current_index
         return super().invoke(context, event)
 
 class ZTOOLS_OT_SelectAllMaterials(Operator):
-    """Select all materials in the list"""
+    """Select all materials the search filter shows"""
     bl_idname = "ztools.select_all_materials"
     bl_label = "Select All Materials"
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        for item in context.scene.ztools_material_list:
-            item.selected = True
+        visible = visible_materials(context.scene).tolist()
+        for item, shown in zip(context.scene.ztools_material_list, visible):
+            if shown:
+                item.selected = True
         return {'FINISHED'}
 
 class ZTOOLS_OT_SelectNoneMaterials(Operator):
-    """Deselect all materials in the list"""
+    """Deselect all materials the search filter shows"""
     bl_idname = "ztools.select_none_materials"
     bl_label = "Deselect All Materials"
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        for item in context.scene.ztools_material_list:
-            item.selected = False
+        visible = visible_materials(context.scene).tolist()
+        for item, shown in zip(context.scene.ztools_material_list, visible):
+            if shown:
+                item.selected = False
         return {'FINISHED'}
 
 
@@ -186,6 +694,9 @@ def draw_panel(context, layout):
 
     # Search Field
     layout.prop(settings, "search_term", icon='VIEWZOOM')
+    row = layout.row(align=True)
+    row.prop(settings, "match_mode", expand=True)
+    row.prop(settings, "sort_mode", text="")
 
     # Selection Mode
     layout.prop(settings, "selection_mode", expand=True)
@@ -222,6 +733,12 @@ def draw_panel(context, layout):
     row.operator("ztools.select_all_materials", text="Select All")
     row.operator("ztools.select_none_materials", text="Select None")
 
+    # Slot usage
+    row = layout.row()
+    row.operator("ztools.material_usage_report", text="Usage Report")
+    row.operator("ztools.purge_unused_slots", text="Purge Unused Slots")
+    layout.operator("ztools.deduplicate_materials", text="Deduplicate Materials")
+
 
 def register():
     bpy.utils.register_class(ZTOOLS_MT_MaterialListItem)
@@ -230,13 +747,30 @@ def register():
     bpy.utils.register_class(ZTOOLS_UL_MaterialList)
     bpy.utils.register_class(ZTOOLS_OT_SelectAllMaterials)
     bpy.utils.register_class(ZTOOLS_OT_SelectNoneMaterials)
+    bpy.utils.register_class(ZTOOLS_OT_MaterialUsageReport)
+    bpy.utils.register_class(ZTOOLS_OT_PurgeUnusedSlots)
+    bpy.utils.register_class(ZTOOLS_OT_DeduplicateMaterials)
 
     # Register properties
     bpy.types.Scene.ztools_material_list = bpy.props.CollectionProperty(type=ZTOOLS_MT_MaterialListItem)
     bpy.types.Scene.ztools_material_list_index = bpy.props.IntProperty(name="Material List Index", default=0)
     bpy.types.Scene.ztools_material_tool_settings = bpy.props.PointerProperty(type=ZTOOLS_PG_MaterialToolSettings)
 
+    # Keep the material usage index current
+    bpy.app.handlers.depsgraph_update_post.append(usage_index_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(usage_index_reset)
+
 def unregister():
+    # Remove the usage index handlers
+    if usage_index_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(usage_index_update)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if usage_index_reset in handlers:
+            handlers.remove(usage_index_reset)
+    clear_usage_index()
+    _filter_arrays.clear()
+
     # Unregister properties
     del bpy.types.Scene.ztools_material_list
     del bpy.types.Scene.ztools_material_list_index
@@ -249,6 +783,9 @@ def unregister():
     bpy.utils.unregister_class(ZTOOLS_MT_MaterialListItem)
     bpy.utils.unregister_class(ZTOOLS_OT_SelectAllMaterials)
     bpy.utils.unregister_class(ZTOOLS_OT_SelectNoneMaterials)
+    bpy.utils.unregister_class(ZTOOLS_OT_MaterialUsageReport)
+    bpy.utils.unregister_class(ZTOOLS_OT_PurgeUnusedSlots)
+    bpy.utils.unregister_class(ZTOOLS_OT_DeduplicateMaterials)
 
 # اجرای اسکریپت در بلندر
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def connected_labels(count, a, b):
+    """
+    Union-find over index pairs (a[i], b[i]) for `count` elements.
+    Returns an int array where each element is labelled with the
+    smallest index of its cluster, so the labels are order independent.
+    """
+    labels = np.arange(count, dtype=np.int64)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+
+    while a.size:
+        la = labels[a]
+        lb = labels[b]
+        pending = la != lb
+        if not pending.any():
+            break
+
+        # Drop pairs that are already joined and hook the larger root onto the smaller one
+        a, b = a[pending], b[pending]
+        low = np.minimum(la[pending], lb[pending])
+        high = np.maximum(la[pending], lb[pending])
+        np.minimum.at(labels, high, low)
+
+        # Path compression: point every element straight at its root
+        while True:
+            compressed = labels[labels]
+            if np.array_equal(compressed, labels):
+                break
+            labels = compressed
+
+    return labels
+
+
+def cluster_groups(labels):
+    """
+    Group element indices by label, skipping single-element clusters.
+    Returns a list of index arrays in ascending index order.
+    """
+    order = np.argsort(labels, kind='stable')
+    sorted_labels = labels[order]
+    splits = np.flatnonzero(np.diff(sorted_labels)) + 1
+    return [group for group in np.split(order, splits) if group.size > 1]